@@ -0,0 +1,176 @@
+"""Shared HTTP client for the ML service.
+
+One pooled keep-alive ``requests.Session`` per process, with per-endpoint
+timeouts, transport-level retries, a circuit breaker and latency metrics.
+Views and Celery tasks go through ``ml_client()`` instead of calling
+``requests`` directly.
+"""
+import os
+import threading
+import time
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class MLServiceUnavailable(Exception):
+    """The ML service could not be reached, timed out, or the circuit is open"""
+
+class CircuitBreaker:
+    """Stops calling a failing service for ``reset_timeout`` seconds.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast. Once ``reset_timeout`` has passed, one trial call is
+    let through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+# Responses meaning the service itself is unreachable or overloaded. Other 5xx are
+# per-request application errors (e.g. one unparseable resume) and leave the circuit alone.
+UNAVAILABLE_STATUSES = (502, 503, 504)
+
+class MLServiceClient:
+    def __init__(self, base_url, timeouts, connect_timeout=2.0, retries=2, pool_size=20,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeouts = timeouts
+        self.connect_timeout = connect_timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        # ML endpoints are idempotent, so POSTs may be retried on connection
+        # errors and gateway failures; 429 is left to the caller's backoff. A read
+        # timeout is not retried: the service got the request and is still working on it
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=0.2,
+            status_forcelist=UNAVAILABLE_STATUSES,
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def post(self, endpoint, *, json=None, data=None, files=None, timeout=None):
+        """POST to an endpoint path (e.g. ``/find-matches/``) and return the response, whatever its status.
+
+        Raises ``MLServiceUnavailable`` when the circuit is open or the
+        request fails at the transport level.
+        """
+        if not self.breaker.allow():
+            self._record(endpoint, None, 'rejected')
+            raise MLServiceUnavailable(f"ML service circuit is open; not calling {endpoint}")
+
+        read_timeout = timeout or self.timeouts.get(endpoint, self.timeouts['default'])
+        started = time.monotonic()
+        try:
+            response = self.session.post(
+                f"{self.base_url}{endpoint}",
+                json=json, data=data, files=files,
+                timeout=(self.connect_timeout, read_timeout),
+            )
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            self._record(endpoint, time.monotonic() - started, 'error')
+            raise MLServiceUnavailable(f"ML service {endpoint} failed: {e}") from e
+
+        if response.status_code in UNAVAILABLE_STATUSES:
+            self.breaker.record_failure()
+            self._record(endpoint, time.monotonic() - started, 'error')
+        else:
+            self.breaker.record_success()
+            self._record(endpoint, time.monotonic() - started, 'ok')
+        return response
+
+    def stats(self):
+        """Per-endpoint call counts and latencies, plus the circuit state (served at /api/ml-client/stats/)"""
+        with self._metrics_lock:
+            endpoints = {
+                endpoint: {
+                    **counts,
+                    'avg_ms': round(counts['total_ms'] / counts['timed'], 2) if counts['timed'] else None,
+                }
+                for endpoint, counts in self._metrics.items()
+            }
+        return {'circuit': self.breaker.state, 'endpoints': endpoints}
+
+    def _record(self, endpoint, elapsed, outcome):
+        with self._metrics_lock:
+            counts = self._metrics.setdefault(endpoint, {
+                'ok': 0, 'error': 0, 'rejected': 0, 'timed': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            })
+            counts[outcome] += 1
+            if elapsed is not None:
+                elapsed_ms = elapsed * 1000
+                counts['timed'] += 1
+                counts['total_ms'] += elapsed_ms
+                counts['max_ms'] = max(counts['max_ms'], elapsed_ms)
+
+
+# ---------------- Process-wide client ----------------
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def ml_client():
+    """Return this process's client, creating it on first use (and after a worker fork)"""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = MLServiceClient(
+                    settings.ML_SERVICE_URL,
+                    timeouts=settings.ML_CLIENT_TIMEOUTS,
+                    connect_timeout=settings.ML_CLIENT_CONNECT_TIMEOUT,
+                    retries=settings.ML_CLIENT_RETRIES,
+                    pool_size=settings.ML_CLIENT_POOL_SIZE,
+                    failure_threshold=settings.ML_CIRCUIT_FAILURE_THRESHOLD,
+                    reset_timeout=settings.ML_CIRCUIT_RESET_TIMEOUT,
+                )
+                _client_pid = os.getpid()
+    return _client
@@ -145,6 +145,73 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Celery Configuration
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+# Tasks are acknowledged after they finish, so work survives worker restarts
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Dedicated queues; size each worker pool separately, e.g.
+#   celery -A config worker -Q parsing --concurrency=4
+#   celery -A config worker -Q matching --concurrency=2
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'resumes.tasks.*': {'queue': 'parsing'},
+    'jobs.tasks.*': {'queue': 'matching'},
+}
+
+# Resume parse pipeline
+PARSE_TASK_MAX_RETRIES = config('PARSE_TASK_MAX_RETRIES', default=5, cast=int)
+PARSE_RETRY_BACKOFF = config('PARSE_RETRY_BACKOFF', default=10, cast=int)  # seconds, doubled per retry
+PARSE_RETRY_BACKOFF_MAX = config('PARSE_RETRY_BACKOFF_MAX', default=600, cast=int)
+PARSE_REQUEST_TIMEOUT = config('PARSE_REQUEST_TIMEOUT', default=120, cast=int)
+PARSE_CLAIM_TIMEOUT = config('PARSE_CLAIM_TIMEOUT', default=900, cast=int)  # after this a 'processing' resume is re-claimable
+
+# Job embed/rematch tasks: retried while the ML service is unavailable
+JOB_TASK_MAX_RETRIES = config('JOB_TASK_MAX_RETRIES', default=8, cast=int)
+JOB_TASK_RETRY_BACKOFF = config('JOB_TASK_RETRY_BACKOFF', default=10, cast=int)  # seconds, doubled per retry
+JOB_TASK_RETRY_BACKOFF_MAX = config('JOB_TASK_RETRY_BACKOFF_MAX', default=600, cast=int)
+
+# ML Service
+ML_SERVICE_URL = config('ML_SERVICE_URL', default='http://localhost:8001')
+# True when MEDIA_ROOT is also mounted in the ML service (as its SHARED_MEDIA_ROOT):
+# resumes are then sent as path references instead of re-uploading the file
+ML_SHARED_STORAGE = config('ML_SHARED_STORAGE', default=False, cast=bool)
+# Shared client (config.ml_client): read timeouts in seconds per endpoint path
+ML_CLIENT_TIMEOUTS = {
+    'default': config('ML_CLIENT_TIMEOUT', default=30, cast=float),
+    '/parse-resume/': PARSE_REQUEST_TIMEOUT,
+    '/parse-resumes/batch': config('ML_CLIENT_BATCH_TIMEOUT', default=600, cast=float),
+    '/find-matches/': config('ML_CLIENT_MATCH_TIMEOUT', default=15, cast=float),
+    '/find-candidates/': config('ML_CLIENT_CANDIDATES_TIMEOUT', default=30, cast=float),
+    '/embed-jobs/': config('ML_CLIENT_EMBED_TIMEOUT', default=60, cast=float),
+    '/rematch-job/': config('ML_CLIENT_REMATCH_TIMEOUT', default=120, cast=float),
+}
+ML_CLIENT_CONNECT_TIMEOUT = config('ML_CLIENT_CONNECT_TIMEOUT', default=2, cast=float)
+ML_CLIENT_RETRIES = config('ML_CLIENT_RETRIES', default=2, cast=int)  # connection errors and 502/503/504, never read timeouts
+ML_CLIENT_POOL_SIZE = config('ML_CLIENT_POOL_SIZE', default=20, cast=int)
+ML_CIRCUIT_FAILURE_THRESHOLD = config('ML_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+ML_CIRCUIT_RESET_TIMEOUT = config('ML_CIRCUIT_RESET_TIMEOUT', default=30, cast=float)
+
+# Caches: match results are kept in-process (LRU + TTL) unless a Redis URL is given
+MATCH_CACHE_REDIS_URL = config('MATCH_CACHE_REDIS_URL', default='')
+MATCH_CACHE_TTL = config('MATCH_CACHE_TTL', default=600, cast=int)
+MATCH_CACHE_MAX_ENTRIES = config('MATCH_CACHE_MAX_ENTRIES', default=5000, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'matches': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': MATCH_CACHE_REDIS_URL,
+        'TIMEOUT': MATCH_CACHE_TTL,
+        'KEY_PREFIX': 'matches',
+    } if MATCH_CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'matches',
+        'TIMEOUT': MATCH_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': MATCH_CACHE_MAX_ENTRIES},
+    },
+}
 
 AUTH_USER_MODEL = 'users.User'
 
@@ -0,0 +1,111 @@
+import socket
+import threading
+from unittest.mock import patch, MagicMock
+import requests
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from .ml_client import CircuitBreaker, MLServiceClient, MLServiceUnavailable
+from .views import MLClientStatsView
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def test_opens_after_threshold_and_allows_one_trial(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        with patch('config.ml_client.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, 'open')
+            self.assertFalse(breaker.allow())
+
+        with patch('config.ml_client.time.monotonic', return_value=131.0):
+            self.assertEqual(breaker.state, 'half-open')
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())  # only one trial call at a time
+            breaker.record_success()
+            self.assertEqual(breaker.state, 'closed')
+
+class MLServiceClientTestCase(SimpleTestCase):
+    def setUp(self):
+        self.client = MLServiceClient(
+            'http://ml:8001/', timeouts={'default': 30, '/find-matches/': 15},
+            failure_threshold=1, reset_timeout=30,
+        )
+
+    def test_uses_endpoint_timeout_and_records_latency(self):
+        self.client.session.post = MagicMock(return_value=MagicMock(status_code=200))
+        self.client.post('/find-matches/', json={'resume_id': 1})
+
+        self.client.session.post.assert_called_once_with(
+            'http://ml:8001/find-matches/', json={'resume_id': 1}, data=None, files=None, timeout=(2.0, 15)
+        )
+        self.assertEqual(self.client.stats()['endpoints']['/find-matches/']['ok'], 1)
+
+    def test_transport_error_opens_circuit_and_fails_fast(self):
+        self.client.session.post = MagicMock(side_effect=requests.ConnectionError('refused'))
+        with self.assertRaises(MLServiceUnavailable):
+            self.client.post('/embed-jobs/', json={})
+        with self.assertRaises(MLServiceUnavailable):
+            self.client.post('/embed-jobs/', json={})
+
+        self.assertEqual(self.client.session.post.call_count, 1)
+        self.assertEqual(self.client.stats()['circuit'], 'open')
+
+    def test_application_errors_do_not_open_circuit(self):
+        self.client.session.post = MagicMock(return_value=MagicMock(status_code=500))
+        self.client.post('/parse-resume/', data={'resume_id': 1})
+        self.client.post('/parse-resume/', data={'resume_id': 2})
+
+        self.assertEqual(self.client.session.post.call_count, 2)
+        self.assertEqual(self.client.stats()['circuit'], 'closed')
+
+    def test_gateway_errors_open_circuit(self):
+        self.client.session.post = MagicMock(return_value=MagicMock(status_code=503))
+        self.client.post('/parse-resume/', data={'resume_id': 1})
+        with self.assertRaises(MLServiceUnavailable):
+            self.client.post('/parse-resume/', data={'resume_id': 2})
+
+    def test_read_timeout_is_not_retried(self):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(5)
+        accepted = []
+
+        def accept_and_hang():
+            # Take requests but never answer them
+            while True:
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    return
+                accepted.append(connection)
+
+        threading.Thread(target=accept_and_hang, daemon=True).start()
+        client = MLServiceClient(f"http://127.0.0.1:{listener.getsockname()[1]}",
+                                 timeouts={'default': 0.2}, retries=2)
+        try:
+            with self.assertRaises(MLServiceUnavailable):
+                client.post('/parse-resume/', data={'resume_id': 1})
+        finally:
+            listener.close()
+            for connection in accepted:
+                connection.close()
+
+        self.assertEqual(len(accepted), 1)
+
+class MLClientStatsViewTestCase(SimpleTestCase):
+    def get(self, is_staff):
+        request = APIRequestFactory().get('/api/ml-client/stats/')
+        force_authenticate(request, user=MagicMock(is_authenticated=True, is_staff=is_staff))
+        return MLClientStatsView.as_view()(request)
+
+    def test_staff_sees_client_stats(self):
+        client = MagicMock()
+        client.stats.return_value = {'circuit': 'closed', 'endpoints': {}}
+        with patch('config.views.ml_client', return_value=client):
+            response = self.get(is_staff=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['circuit'], 'closed')
+
+    def test_other_users_are_refused(self):
+        self.assertEqual(self.get(is_staff=False).status_code, 403)
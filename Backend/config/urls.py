@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .views import MLClientStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,6 +13,7 @@ urlpatterns = [
     path('api/jobs/', include('jobs.urls')),
     path('api/resumes/', include('resumes.urls')),
     path('api/matches/', include('matches.urls')),
+    path('api/ml-client/stats/', MLClientStatsView.as_view(), name='ml-client-stats'),
 ]
 
 if settings.DEBUG:
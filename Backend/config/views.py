@@ -0,0 +1,11 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from .ml_client import ml_client
+
+class MLClientStatsView(APIView):
+    """Circuit state and per-endpoint ML call counts/latencies of the serving process"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(ml_client().stats())
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+import requests
+from config.ml_client import ml_client, MLServiceUnavailable
+from jobs.models import Job
+
+class Command(BaseCommand):
+    help = "Compute stored embeddings for existing jobs through the ML service"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--force', action='store_true',
+                            help="Re-encode jobs even if their content hash is unchanged")
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Only send jobs that have no stored embedding yet")
+
+    def handle(self, *args, **options):
+        queryset = Job.objects.order_by('id')
+        if options['missing_only']:
+            queryset = queryset.filter(embedding__isnull=True)
+
+        job_ids = list(queryset.values_list('id', flat=True))
+        batch_size = max(options['batch_size'], 1)
+        embedded = skipped = 0
+
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start:start + batch_size]
+            try:
+                response = ml_client().post(
+                    '/embed-jobs/',
+                    json={'job_ids': batch, 'force': options['force']},
+                    timeout=300
+                )
+                response.raise_for_status()
+            except (MLServiceUnavailable, requests.HTTPError) as e:
+                raise CommandError(f"ML service request failed at job {batch[0]}: {e}")
+
+            result = response.json()
+            embedded += result.get('embedded', 0)
+            skipped += result.get('skipped', 0)
+            self.stdout.write(f"Processed {start + len(batch)}/{len(job_ids)} jobs")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {embedded} embedded, {skipped} already up to date"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='embedding_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_model',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_vector',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
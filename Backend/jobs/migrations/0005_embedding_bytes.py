@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:33
+
+import json
+import struct
+from django.db import migrations, models
+
+
+def pack_embeddings(apps, schema_editor):
+    """Re-encode JSON embeddings as little-endian float32 bytes"""
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.exclude(embedding_vector__isnull=True).only('id', 'embedding_vector').iterator(chunk_size=500):
+        values = job.embedding_vector
+        if isinstance(values, str):
+            values = json.loads(values)
+        if values:
+            job.embedding = struct.pack(f'<{len(values)}f', *values)
+            job.embedding_dim = len(values)
+            batch.append(job)
+        if len(batch) >= 500:
+            Job.objects.bulk_update(batch, ['embedding', 'embedding_dim'])
+            batch = []
+    Job.objects.bulk_update(batch, ['embedding', 'embedding_dim'])
+
+
+def unpack_embeddings(apps, schema_editor):
+    """Reverse of pack_embeddings: decode float32 bytes back into JSON lists"""
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.exclude(embedding__isnull=True).only('id', 'embedding').iterator(chunk_size=500):
+        data = bytes(job.embedding)
+        job.embedding_vector = list(struct.unpack(f'<{len(data) // 4}f', data[:len(data) // 4 * 4]))
+        batch.append(job)
+        if len(batch) >= 500:
+            Job.objects.bulk_update(batch, ['embedding_vector'])
+            batch = []
+    Job.objects.bulk_update(batch, ['embedding_vector'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_catalogversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_dim',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name='job',
+            name='embedding_vector',
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from users.models import User
 
 class Job(models.Model):
@@ -26,11 +27,42 @@ class Job(models.Model):
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     is_active = models.BooleanField(default=True)
+
+    # Precomputed embedding (little-endian float32 bytes), maintained by the ML service
+    embedding = models.BinaryField(null=True, blank=True)
+    embedding_model = models.CharField(max_length=100, blank=True)
+    embedding_dim = models.PositiveSmallIntegerField(null=True, blank=True)
+    embedding_hash = models.CharField(max_length=64, blank=True)  # SHA-256 of the embedded text
+
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # ML index syncs read changes by it
     
     class Meta:
         ordering = ['-created_at']
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+class CatalogVersion(models.Model):
+    """Single-row counter bumped whenever the job catalog changes (used in match cache keys)"""
+    version = models.BigIntegerField(default=0)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.get_or_create(pk=1)[0].version
+
+    @classmethod
+    def bump(cls):
+        cls.objects.get_or_create(pk=1)
+        cls.objects.filter(pk=1).update(version=F('version') + 1)
+
+    def __str__(self):
+        return f"Job catalog v{self.version}"
+
+class DeletedJob(models.Model):
+    """Tombstone of a deleted job, so the ML service can drop it from its in-memory index"""
+    job_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Job {self.job_id} deleted at {self.deleted_at}"
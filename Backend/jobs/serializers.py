@@ -8,8 +8,9 @@ class JobSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Job
-        fields = '__all__'
-        read_only_fields = ['recruiter', 'created_at', 'updated_at']
+        exclude = ['embedding']
+        read_only_fields = ['recruiter', 'created_at', 'updated_at',
+                            'embedding_model', 'embedding_dim', 'embedding_hash']
 
     def create(self, validated_data):
         request = self.context.get('request')
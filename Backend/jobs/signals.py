@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Job, CatalogVersion, DeletedJob
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_catalog_version(sender, **kwargs):
+    """Any job create/update/delete invalidates cached match results"""
+    CatalogVersion.bump()
+
+@receiver(post_delete, sender=Job)
+def record_deleted_job(sender, instance, **kwargs):
+    """Deleted rows leave no updated_at behind: tell the ML index syncs explicitly"""
+    DeletedJob.objects.create(job_id=instance.pk)
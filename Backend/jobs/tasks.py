@@ -0,0 +1,45 @@
+from celery import shared_task
+from django.conf import settings
+import random
+from config.ml_client import ml_client, MLServiceUnavailable
+
+class RetryableMLError(Exception):
+    """The ML service is temporarily unable to answer (busy, timing out or erroring)"""
+
+def _retry_countdown(retries):
+    """Exponential backoff with full jitter, capped at JOB_TASK_RETRY_BACKOFF_MAX seconds"""
+    backoff = min(settings.JOB_TASK_RETRY_BACKOFF * 2 ** retries, settings.JOB_TASK_RETRY_BACKOFF_MAX)
+    return random.uniform(0, backoff)
+
+def _post_or_retry(task, endpoint, payload):
+    """POST to the ML service, retrying the task while the service is unavailable"""
+    try:
+        response = ml_client().post(endpoint, json=payload)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableMLError(f"ML service returned {response.status_code}: {response.text[:500]}")
+    except (MLServiceUnavailable, RetryableMLError) as e:
+        if task.request.retries >= task.max_retries:
+            return None, str(e)
+        raise task.retry(exc=e, countdown=_retry_countdown(task.request.retries))
+    if response.status_code != 200:
+        return None, response.text
+    return response, None
+
+@shared_task(bind=True, acks_late=True, max_retries=settings.JOB_TASK_MAX_RETRIES)
+def embed_job_async(self, job_id):
+    """Ask the ML service to (re)compute the stored embedding for a job"""
+    response, error = _post_or_retry(self, '/embed-jobs/', {'job_ids': [job_id]})
+    if error is not None:
+        return {'status': 'error', 'job_id': job_id, 'message': error}
+
+    # Stored matches depend on the new vector: refresh them next
+    rematch_job_async.delay(job_id)
+    return {'status': 'success', 'job_id': job_id, **response.json()}
+
+@shared_task(bind=True, acks_late=True, max_retries=settings.JOB_TASK_MAX_RETRIES)
+def rematch_job_async(self, job_id):
+    """Rescore one job against all parsed resumes and upsert its matches (prunes them if inactive)"""
+    response, error = _post_or_retry(self, '/rematch-job/', {'job_id': job_id})
+    if error is not None:
+        return {'status': 'error', 'job_id': job_id, 'message': error}
+    return {'status': 'success', **response.json()}
@@ -1,8 +1,9 @@
+from unittest.mock import MagicMock, patch
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Job
+from .models import Job, DeletedJob
 
 User = get_user_model()
 
@@ -45,4 +46,98 @@ class JobAPITestCase(TestCase):
         )
         response = self.client.get('/api/jobs/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
\ No newline at end of file
+        self.assertEqual(len(response.data), 1)
+
+    @patch('jobs.views.embed_job_async')
+    def test_create_job_schedules_embedding(self, mock_task):
+        data = {
+            'title': 'Data Engineer',
+            'description': 'Pipelines',
+            'requirements': 'SQL',
+            'skills_required': 'Python, SQL',
+            'experience_level': 'mid',
+            'job_type': 'full-time',
+            'location': 'Remote',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/jobs/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('embedding', response.data)
+        mock_task.delay.assert_called_once_with(response.data['id'])
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_find_candidates_paginates_ml_results(self, mock_post):
+        job = Job.objects.create(
+            recruiter=self.recruiter,
+            title='ML Engineer',
+            description='Models',
+            requirements='Python',
+            skills_required='Python',
+            experience_level='senior',
+            job_type='full-time',
+            location='Remote'
+        )
+        mock_post.return_value = MagicMock(status_code=200)
+        mock_post.return_value.json.return_value = {
+            'total': 3,
+            'candidates': [{'resume_id': 1, 'candidate_id': 1, 'match_score': 80.0}],
+        }
+
+        response = self.client.get(f'/api/jobs/{job.id}/find_candidates/?page=2&page_size=1')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+        self.assertEqual(mock_post.call_args.kwargs['json'], {'job_id': job.id, 'limit': 1, 'offset': 1})
+
+    def test_delete_job_records_tombstone(self):
+        job = Job.objects.create(
+            recruiter=self.recruiter, title='Data Engineer', description='d', requirements='r',
+            skills_required='Python', experience_level='mid', job_type='full-time', location='Remote',
+        )
+        response = self.client.delete(f'/api/jobs/{job.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(DeletedJob.objects.values_list('job_id', flat=True)), [job.id])
+
+
+class JobTasksTestCase(TestCase):
+    @patch('jobs.tasks.rematch_job_async.delay')
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_embedding_success_schedules_rematch(self, mock_post, mock_rematch):
+        from .tasks import embed_job_async
+        mock_post.return_value = MagicMock(status_code=200)
+        mock_post.return_value.json.return_value = {'embedded': 1, 'skipped': 0}
+
+        result = embed_job_async(42)
+
+        self.assertEqual(result['status'], 'success')
+        mock_rematch.assert_called_once_with(42)
+
+    @patch('jobs.tasks.rematch_job_async.delay')
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_embedding_retries_while_ml_service_is_unavailable(self, mock_post, mock_rematch):
+        from config.ml_client import MLServiceUnavailable
+        from .tasks import embed_job_async
+        success = MagicMock(status_code=200)
+        success.json.return_value = {'embedded': 1, 'skipped': 0}
+        mock_post.side_effect = [MLServiceUnavailable('circuit open'), MagicMock(status_code=503), success]
+
+        result = embed_job_async.apply(args=[42]).get()
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(mock_post.call_count, 3)
+        mock_rematch.assert_called_once_with(42)
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_rematch_gives_up_after_max_retries(self, mock_post):
+        from config.ml_client import MLServiceUnavailable
+        from .tasks import rematch_job_async
+        mock_post.side_effect = MLServiceUnavailable('circuit open')
+
+        with self.settings(JOB_TASK_RETRY_BACKOFF=0):
+            result = rematch_job_async.apply(args=[42]).get()
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(mock_post.call_count, rematch_job_async.max_retries + 1)
@@ -1,9 +1,17 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from django.db import transaction
+from resumes.models import Resume
 from .models import Job
 from .serializers import JobSerializer
+from config.ml_client import ml_client, MLServiceUnavailable
+from .tasks import embed_job_async
 
 class JobViewSet(viewsets.ModelViewSet):
     serializer_class = JobSerializer
@@ -25,17 +33,76 @@ class JobViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if not user.is_authenticated or getattr(user, 'user_type', None) != 'recruiter':
             raise PermissionDenied("Only authenticated recruiters can create jobs.")
-        serializer.save(recruiter=user)
+        job = serializer.save(recruiter=user)
+        self._schedule_embedding(job)
 
     def perform_update(self, serializer):
         job = self.get_object()
         user = self.request.user
         if not user.is_authenticated or job.recruiter != user:
             raise PermissionDenied("You do not have permission to update this job.")
-        serializer.save()
+        job = serializer.save()
+        self._schedule_embedding(job)
 
     def perform_destroy(self, instance):
         user = self.request.user
         if not user.is_authenticated or instance.recruiter != user:
             raise PermissionDenied("You do not have permission to delete this job.")
         instance.delete()
+
+    @action(detail=True, methods=['get'])
+    def find_candidates(self, request, pk=None):
+        """Best-matching parsed resumes for one of the recruiter's jobs, paginated like list views"""
+        user = request.user
+        if not user.is_authenticated or getattr(user, 'user_type', None) != 'recruiter':
+            raise PermissionDenied("Only recruiters can search candidates.")
+        job = self.get_object()  # recruiters only see their own jobs
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', settings.REST_FRAMEWORK['PAGE_SIZE'])), 1), 100)
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            response = ml_client().post(
+                '/find-candidates/',
+                json={'job_id': job.id, 'limit': page_size, 'offset': (page - 1) * page_size},
+            )
+        except MLServiceUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if response.status_code != 200:
+            return Response(
+                {"error": f"ML service failed with status {response.status_code}", "details": response.text},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+
+        data = response.json()
+        results = data['candidates']
+        resumes = Resume.objects.select_related('user').in_bulk([item['resume_id'] for item in results])
+        for item in results:
+            resume = resumes.get(item['resume_id'])
+            if resume is not None:
+                item['candidate_username'] = resume.user.username
+                item['original_filename'] = resume.original_filename
+
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, 'page', page + 1) if page * page_size < data['total'] else None
+        if page == 1:
+            previous_url = None
+        elif page == 2:
+            previous_url = remove_query_param(url, 'page')
+        else:
+            previous_url = replace_query_param(url, 'page', page - 1)
+
+        return Response({'count': data['total'], 'next': next_url, 'previous': previous_url, 'results': results})
+
+    def _schedule_embedding(self, job):
+        """Refresh the stored job embedding once the transaction commits"""
+        def enqueue():
+            try:
+                embed_job_async.delay(job.id)
+            except Exception as e:
+                print(f"Error scheduling job embedding: {e}")
+
+        transaction.on_commit(enqueue)
@@ -0,0 +1,19 @@
+import hashlib
+import json
+from django.core.cache import caches
+from jobs.models import CatalogVersion
+
+def _cache():
+    return caches['matches']
+
+def match_cache_key(resume, top_k, filters=None):
+    """Key on everything that can change a ranking: resume, its embedding, top_k, filters and the job catalog"""
+    embedding_hash = hashlib.sha1(bytes(resume.embedding or b'')).hexdigest()
+    filters_hash = hashlib.sha1(json.dumps(filters or {}, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return f"{resume.id}:{embedding_hash}:{top_k}:{filters_hash}:{CatalogVersion.current()}"
+
+def get_cached_matches(key):
+    return _cache().get(key)
+
+def cache_matches(key, data):
+    _cache().set(key, data)
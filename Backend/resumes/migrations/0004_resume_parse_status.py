@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+
+def mark_parsed(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+    Resume.objects.filter(is_parsed=True).update(parse_status='parsed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0003_resume_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='parse_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='parse_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='parse_key',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='parse_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='parse_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('queued', 'Queued'), ('processing', 'Processing'), ('parsed', 'Parsed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_parsed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:33
+
+import json
+import struct
+from django.db import migrations, models
+
+
+def pack_embeddings(apps, schema_editor):
+    """Re-encode JSON embeddings as little-endian float32 bytes"""
+    Resume = apps.get_model('resumes', 'Resume')
+    batch = []
+    for resume in Resume.objects.exclude(embedding_vector__isnull=True).only('id', 'embedding_vector').iterator(chunk_size=500):
+        values = resume.embedding_vector
+        if isinstance(values, str):
+            values = json.loads(values)
+        if values:
+            resume.embedding = struct.pack(f'<{len(values)}f', *values)
+            resume.embedding_dim = len(values)
+            batch.append(resume)
+        if len(batch) >= 500:
+            Resume.objects.bulk_update(batch, ['embedding', 'embedding_dim'])
+            batch = []
+    Resume.objects.bulk_update(batch, ['embedding', 'embedding_dim'])
+
+
+def unpack_embeddings(apps, schema_editor):
+    """Reverse of pack_embeddings: decode float32 bytes back into JSON lists"""
+    Resume = apps.get_model('resumes', 'Resume')
+    batch = []
+    for resume in Resume.objects.exclude(embedding__isnull=True).only('id', 'embedding').iterator(chunk_size=500):
+        data = bytes(resume.embedding)
+        resume.embedding_vector = list(struct.unpack(f'<{len(data) // 4}f', data[:len(data) // 4 * 4]))
+        batch.append(resume)
+        if len(batch) >= 500:
+            Resume.objects.bulk_update(batch, ['embedding_vector'])
+            batch = []
+    Resume.objects.bulk_update(batch, ['embedding_vector'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0004_resume_parse_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_dim',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_model',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name='resume',
+            name='embedding_vector',
+        ),
+    ]
@@ -2,6 +2,19 @@ from django.db import models
 from users.models import User
 
 class Resume(models.Model):
+    PARSE_PENDING = 'pending'
+    PARSE_QUEUED = 'queued'
+    PARSE_PROCESSING = 'processing'
+    PARSE_PARSED = 'parsed'
+    PARSE_FAILED = 'failed'
+    PARSE_STATUS_CHOICES = (
+        (PARSE_PENDING, 'Pending'),
+        (PARSE_QUEUED, 'Queued'),
+        (PARSE_PROCESSING, 'Processing'),
+        (PARSE_PARSED, 'Parsed'),
+        (PARSE_FAILED, 'Failed'),
+    )
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
     file = models.FileField(upload_to='resumes/')
     original_filename = models.CharField(max_length=255)
@@ -11,11 +24,30 @@ class Resume(models.Model):
     extracted_skills = models.TextField(blank=True)
     extracted_education = models.TextField(blank=True)
     extracted_experience = models.TextField(blank=True)
-    embedding_vector = models.JSONField(null=True, blank=True)  # Store BERT embeddings
+    # Sentence embedding as little-endian float32 bytes, written by the ML service
+    embedding = models.BinaryField(null=True, blank=True)
+    embedding_model = models.CharField(max_length=100, blank=True)
+    embedding_dim = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of the file bytes
     
     is_parsed = models.BooleanField(default=False)
+
+    # Parse pipeline state (see resumes.tasks.parse_resume_async)
+    parse_status = models.CharField(max_length=20, choices=PARSE_STATUS_CHOICES, default=PARSE_PENDING, db_index=True)
+    parse_error = models.TextField(blank=True)
+    parse_attempts = models.PositiveSmallIntegerField(default=0)
+    parse_started_at = models.DateTimeField(null=True, blank=True)
+    parse_key = models.CharField(max_length=255, blank=True)  # idempotency key of the last successful parse
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # ML index syncs read changes by it
     
     def __str__(self):
-        return f"{self.user.username} - {self.original_filename}"
\ No newline at end of file
+        return f"{self.user.username} - {self.original_filename}"
+
+class DeletedResume(models.Model):
+    """Tombstone of a deleted resume, so the ML service can drop it from its in-memory index"""
+    resume_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Resume {self.resume_id} deleted at {self.deleted_at}"
@@ -4,7 +4,9 @@ from .models import Resume
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
-        fields = '__all__'
+        exclude = ['embedding']
         read_only_fields = ['user', 'parsed_text', 'extracted_skills', 
                            'extracted_education', 'extracted_experience', 
-                           'embedding_vector', 'is_parsed']
\ No newline at end of file
+                           'embedding_model', 'embedding_dim', 'content_hash', 'is_parsed',
+                           'parse_status', 'parse_error', 'parse_attempts',
+                           'parse_started_at', 'parse_key']
\ No newline at end of file
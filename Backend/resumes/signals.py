@@ -0,0 +1,8 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Resume, DeletedResume
+
+@receiver(post_delete, sender=Resume)
+def record_deleted_resume(sender, instance, **kwargs):
+    """Deleted rows leave no updated_at behind: tell the ML index syncs explicitly"""
+    DeletedResume.objects.create(resume_id=instance.pk)
@@ -1,29 +1,118 @@
 from celery import shared_task
-import requests
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from datetime import timedelta
+import random
+from config.ml_client import ml_client, MLServiceUnavailable
 from .models import Resume
 
-@shared_task
-def parse_resume_async(resume_id):
-    """Asynchronously parse resume using ML service"""
+class RetryableParseError(Exception):
+    """The ML service is temporarily unable to parse (busy, timing out or erroring)"""
+
+def parse_idempotency_key(resume):
+    """Identifies one parse of one stored file; re-uploading a file yields a new key"""
+    return f"parse:{resume.id}:{resume.file.name}"
+
+def _claim_resume(resume_id):
+    """Move a resume to 'processing' unless another worker is already parsing it.
+
+    A claim older than PARSE_CLAIM_TIMEOUT is treated as abandoned (worker
+    crashed mid-task) so the redelivered message can take over.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.PARSE_CLAIM_TIMEOUT)
+    claimable = Q(parse_status__in=[Resume.PARSE_PENDING, Resume.PARSE_QUEUED, Resume.PARSE_FAILED]) | Q(
+        parse_status=Resume.PARSE_PROCESSING, parse_started_at__lt=stale
+    )
+    return Resume.objects.filter(claimable, id=resume_id).update(
+        parse_status=Resume.PARSE_PROCESSING,
+        parse_started_at=now,
+        parse_attempts=F('parse_attempts') + 1,
+    ) == 1
+
+def _post_parse_request(resume):
+    """Send the stored file (or a reference to it) to the ML service as form data"""
+    if settings.ML_SHARED_STORAGE:
+        # ML service reads the stored file itself; nothing is re-uploaded
+        return ml_client().post(
+            '/parse-resume/',
+            data={'resume_id': str(resume.id), 'file_path': resume.file.name},
+        )
+    with resume.file.open('rb') as f:
+        return ml_client().post(
+            '/parse-resume/',
+            files={'file': (resume.original_filename or resume.file.name, f)},
+            data={'resume_id': str(resume.id)},
+        )
+
+def _retry_countdown(retries):
+    """Exponential backoff with full jitter, capped at PARSE_RETRY_BACKOFF_MAX seconds"""
+    backoff = min(settings.PARSE_RETRY_BACKOFF * 2 ** retries, settings.PARSE_RETRY_BACKOFF_MAX)
+    return random.uniform(0, backoff)
+
+@shared_task(bind=True, acks_late=True, max_retries=settings.PARSE_TASK_MAX_RETRIES)
+def parse_resume_async(self, resume_id, idempotency_key=None):
+    """Parse a stored resume through the ML service; safe to deliver more than once"""
     try:
         resume = Resume.objects.get(id=resume_id)
-        
-        # Call ML service
-        ml_service_url = 'http://localhost:8001/parse-resume/'
-        response = requests.post(
-            ml_service_url,
-            json={'resume_id': resume_id},
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            return {'status': 'success', 'resume_id': resume_id}
-        else:
-            return {'status': 'error', 'message': response.text}
-            
     except Resume.DoesNotExist:
         return {'status': 'error', 'message': 'Resume not found'}
+
+    key = idempotency_key or parse_idempotency_key(resume)
+    if resume.parse_status == Resume.PARSE_PARSED and resume.parse_key == key:
+        return {'status': 'skipped', 'resume_id': resume_id, 'message': 'Already parsed'}
+    if not _claim_resume(resume_id):
+        return {'status': 'skipped', 'resume_id': resume_id, 'message': 'Parse already in progress'}
+
+    try:
+        response = _post_parse_request(resume)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableParseError(f"ML service returned {response.status_code}: {response.text[:500]}")
+    except (MLServiceUnavailable, RetryableParseError) as e:
+        if self.request.retries >= self.max_retries:
+            Resume.objects.filter(id=resume_id).update(parse_status=Resume.PARSE_FAILED, parse_error=str(e))
+            return {'status': 'error', 'resume_id': resume_id, 'message': str(e)}
+        Resume.objects.filter(id=resume_id).update(parse_status=Resume.PARSE_QUEUED, parse_error=str(e))
+        raise self.retry(exc=e, countdown=_retry_countdown(self.request.retries))
     except Exception as e:
-        return {'status': 'error', 'message': str(e)}
+        Resume.objects.filter(id=resume_id).update(parse_status=Resume.PARSE_FAILED, parse_error=str(e))
+        return {'status': 'error', 'resume_id': resume_id, 'message': str(e)}
+
+    if response.status_code != 200:
+        # Client errors (bad file, missing resume) will not succeed on retry
+        Resume.objects.filter(id=resume_id).update(parse_status=Resume.PARSE_FAILED, parse_error=response.text)
+        return {'status': 'error', 'resume_id': resume_id, 'message': response.text}
+
+    Resume.objects.filter(id=resume_id).update(parse_status=Resume.PARSE_PARSED, parse_error='', parse_key=key)
+    return {'status': 'success', 'resume_id': resume_id}
+
+@shared_task
+def parse_resumes_batch_async(resume_ids, batch_size=100):
+    """Bulk-parse stored resumes through the ML service batch endpoint"""
+    parsed, missing, errors = [], [], []
+    for start in range(0, len(resume_ids), batch_size):
+        batch = resume_ids[start:start + batch_size]
+        try:
+            response = ml_client().post(
+                '/parse-resumes/batch',
+                data={'resume_ids': [str(resume_id) for resume_id in batch]},
+            )
+            if response.status_code == 200:
+                result = response.json()
+                parsed.extend(result.get('parsed', []))
+                missing.extend(result.get('missing', []))
+                errors.extend(result.get('errors', []))
+            else:
+                errors.append({'resume_ids': batch, 'message': response.text})
+        except Exception as e:
+            errors.append({'resume_ids': batch, 'message': str(e)})
+
+    return {
+        'status': 'error' if errors else 'success',
+        'parsed': parsed,
+        'missing': missing,
+        'errors': errors,
+    }
 
 # @shared_taskexport default Register;
\ No newline at end of file
@@ -1,3 +1,163 @@
-from django.test import TestCase
+import struct
+import tempfile
+from unittest.mock import patch, MagicMock
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from jobs.models import Job
+from .models import Resume, DeletedResume
+from .tasks import parse_resume_async, parse_idempotency_key
 
-# Create your tests here.
+User = get_user_model()
+
+class FindMatchesCacheTestCase(TestCase):
+    def setUp(self):
+        caches['matches'].clear()
+        self.client = APIClient()
+        self.candidate = User.objects.create_user(
+            username='candidate1',
+            email='candidate@test.com',
+            password='testpass123',
+            user_type='candidate'
+        )
+        self.recruiter = User.objects.create_user(
+            username='recruiter1',
+            email='recruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        self.resume = Resume.objects.create(
+            user=self.candidate,
+            file='resumes/test.pdf',
+            original_filename='test.pdf',
+            embedding=struct.pack('<3f', 0.1, 0.2, 0.3),
+            embedding_dim=3,
+            is_parsed=True
+        )
+        self.client.force_authenticate(user=self.candidate)
+
+    def _ml_response(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'status': 'success', 'resume_id': self.resume.id, 'matches': []}
+        return response
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_repeated_find_matches_is_served_from_cache(self, mock_post):
+        mock_post.return_value = self._ml_response()
+        url = f'/api/resumes/{self.resume.id}/find_matches/'
+
+        first = self.client.post(url, {'top_k': 5}, format='json')
+        second = self.client.post(url, {'top_k': 5}, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_job_change_invalidates_cache(self, mock_post):
+        mock_post.return_value = self._ml_response()
+        url = f'/api/resumes/{self.resume.id}/find_matches/'
+
+        self.client.post(url, {'top_k': 5}, format='json')
+        Job.objects.create(
+            recruiter=self.recruiter,
+            title='New Job',
+            description='Test',
+            requirements='Test',
+            skills_required='Python',
+            experience_level='entry',
+            job_type='full-time',
+            location='Remote'
+        )
+        self.client.post(url, {'top_k': 5}, format='json')
+
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_filters_are_forwarded_and_cached_separately(self, mock_post):
+        mock_post.return_value = self._ml_response()
+        url = f'/api/resumes/{self.resume.id}/find_matches/'
+
+        self.client.post(url, {'top_k': 5}, format='json')
+        self.client.post(url, {'top_k': 5, 'job_type': 'contract', 'location': 'Remote'}, format='json')
+
+        self.assertEqual(mock_post.call_count, 2)
+        payload = mock_post.call_args.kwargs['json']
+        self.assertEqual(payload['job_type'], ['contract'])
+        self.assertEqual(payload['location'], 'Remote')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), ML_SHARED_STORAGE=True)
+class ParsePipelineTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.candidate = User.objects.create_user(
+            username='candidate2',
+            email='candidate2@test.com',
+            password='testpass123',
+            user_type='candidate'
+        )
+        self.client.force_authenticate(user=self.candidate)
+
+    def _resume(self, **fields):
+        return Resume.objects.create(
+            user=self.candidate,
+            file='resumes/cv.pdf',
+            original_filename='cv.pdf',
+            **fields
+        )
+
+    @patch('resumes.views.parse_resume_async.delay')
+    def test_upload_enqueues_parse_after_commit(self, mock_delay):
+        upload = SimpleUploadedFile('cv.pdf', b'%PDF-1.4', content_type='application/pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/resumes/', {'file': upload, 'original_filename': 'cv.pdf'}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['parse_status'], Resume.PARSE_QUEUED)
+        resume = Resume.objects.get()
+        mock_delay.assert_called_once_with(resume.id, idempotency_key=parse_idempotency_key(resume))
+
+        status_response = self.client.get(f'/api/resumes/{resume.id}/parse_status/')
+        self.assertEqual(status_response.data['parse_status'], Resume.PARSE_QUEUED)
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_task_posts_form_data_and_marks_parsed(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=200)
+        resume = self._resume(parse_status=Resume.PARSE_QUEUED)
+
+        result = parse_resume_async.apply(args=(resume.id,)).get()
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(mock_post.call_args.kwargs['data'], {'resume_id': str(resume.id), 'file_path': 'resumes/cv.pdf'})
+        resume.refresh_from_db()
+        self.assertEqual(resume.parse_status, Resume.PARSE_PARSED)
+        self.assertEqual(resume.parse_attempts, 1)
+
+        # Redelivery of the same message does not call the ML service again
+        parse_resume_async.apply(args=(resume.id,))
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('config.ml_client.MLServiceClient.post')
+    def test_busy_ml_service_is_retried_then_fails(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=429, text='busy')
+        resume = self._resume(parse_status=Resume.PARSE_QUEUED)
+
+        with self.settings(PARSE_RETRY_BACKOFF=0):
+            parse_resume_async.apply(args=(resume.id,))
+
+        self.assertEqual(mock_post.call_count, parse_resume_async.max_retries + 1)
+        resume.refresh_from_db()
+        self.assertEqual(resume.parse_status, Resume.PARSE_FAILED)
+
+class ResumeTombstoneTestCase(TestCase):
+    def test_deleting_user_records_tombstones_for_their_resumes(self):
+        user = User.objects.create_user(username='candidate2', password='testpass123', user_type='candidate')
+        resume = Resume.objects.create(user=user, file='resumes/cv.pdf', original_filename='cv.pdf')
+
+        user.delete()
+
+        self.assertEqual(list(DeletedResume.objects.values_list('resume_id', flat=True)), [resume.id])
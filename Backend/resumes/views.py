@@ -4,8 +4,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from .models import Resume
 from .serializers import ResumeSerializer
-import requests, threading, os
-from django.conf import settings
+from .match_cache import match_cache_key, get_cached_matches, cache_matches
+from .tasks import parse_resume_async, parse_idempotency_key
+from django.db import transaction
+from config.ml_client import ml_client, MLServiceUnavailable
 
 class ResumeViewSet(viewsets.ModelViewSet):
     serializer_class = ResumeSerializer
@@ -17,11 +19,12 @@ class ResumeViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         resume = serializer.save(
             user=self.request.user,
-            original_filename=self.request.FILES['file'].name
+            original_filename=self.request.FILES['file'].name,
+            parse_status=Resume.PARSE_QUEUED
         )
 
-        # Trigger ML parsing in background
-        threading.Thread(target=self._call_ml_service_parse, args=(resume,)).start()
+        # Parse through the Celery 'parsing' queue once the row is committed
+        self._schedule_parse(resume)
         return resume
 
     def create(self, request, *args, **kwargs):
@@ -33,33 +36,44 @@ class ResumeViewSet(viewsets.ModelViewSet):
         # Always return ID + fields
         return Response(self.get_serializer(resume).data, status=status.HTTP_201_CREATED)
 
-    def _call_ml_service_parse(self, resume):
-        """Send file to ML service for parsing"""
-        try:
-            ml_service_url = 'http://localhost:8001/parse-resume/'
-            file_path = os.path.join(settings.MEDIA_ROOT, resume.file.name)
-
-            with open(file_path, 'rb') as f:
-                response = requests.post(
-                    ml_service_url,
-                    files={'file': f},
-                    data={'resume_id': str(resume.id)}  # still form-data
-                )
+    def _schedule_parse(self, resume):
+        key = parse_idempotency_key(resume)
 
-            print("ML Service parse response:", response.status_code, response.text)
+        def enqueue():
+            try:
+                parse_resume_async.delay(resume.id, idempotency_key=key)
+            except Exception as e:
+                print(f"Error scheduling resume parse: {e}")
+                Resume.objects.filter(id=resume.id).update(parse_status=Resume.PARSE_FAILED, parse_error=str(e))
 
-        except Exception as e:
-            print(f"Error calling ML service: {e}")
+        transaction.on_commit(enqueue)
+
+    @action(detail=True, methods=['get'])
+    def parse_status(self, request, pk=None):
+        """Poll the parse pipeline state of a resume"""
+        resume = self.get_object()
+        return Response({
+            'id': resume.id,
+            'parse_status': resume.parse_status,
+            'is_parsed': resume.is_parsed,
+            'parse_error': resume.parse_error,
+            'parse_attempts': resume.parse_attempts,
+        })
 
     @action(detail=True, methods=['post'])
     def find_matches(self, request, pk=None):
         resume = self.get_object()
         try:
-            ml_service_url = 'http://localhost:8001/find-matches/'
             top_k = int(request.data.get('top_k', 10))
-            payload = {'resume_id': resume.id, 'top_k': top_k}
+            filters = self._match_filters(request.data)
+            payload = {'resume_id': resume.id, 'top_k': top_k, **filters}
 
-            response = requests.post(ml_service_url, json=payload)
+            cache_key = match_cache_key(resume, top_k, filters)
+            cached = get_cached_matches(cache_key)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+
+            response = ml_client().post('/find-matches/', json=payload)
 
             if response.status_code != 200:
                 return Response(
@@ -75,7 +89,22 @@ class ResumeViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_502_BAD_GATEWAY
                 )
 
+            cache_matches(cache_key, json_data)
             return Response(json_data, status=status.HTTP_200_OK)
 
+        except MLServiceUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _match_filters(data):
+        """Optional hard filters for find_matches: experience_level / job_type (one or many) and location"""
+        filters = {}
+        for field in ('experience_level', 'job_type'):
+            value = data.get(field)
+            if value:
+                filters[field] = sorted(value) if isinstance(value, list) else [value]
+        if data.get('location'):
+            filters['location'] = data['location']
+        return filters
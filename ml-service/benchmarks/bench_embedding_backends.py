@@ -0,0 +1,84 @@
+"""Compare the embedding inference backends (EMBEDDING_BACKEND).
+
+Each backend is loaded in its own process so resident memory is measured
+in isolation. Reports load time, single-text latency, batch throughput,
+peak RSS and the smallest cosine similarity with the FP32 torch backend
+on the parity probes.
+
+    python -m benchmarks.bench_embedding_backends --backends torch torch-int8 onnx-int8
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from services.embedding_backends import BACKENDS, PARITY_PROBES, PARITY_THRESHOLD, normalize, load_model
+from services.embedding_service import EMBEDDING_MODEL_NAME
+
+SAMPLE_TEXT = ("Senior data engineer with eight years of experience in Python, SQL, Apache Spark, "
+               "Airflow, Docker, Kubernetes and AWS. Built streaming pipelines processing 2B events a day.")
+
+def run_backend(model_name, backend, repeat, batch_size):
+    """Worker side: measure one backend and return the results as a dict"""
+    started = time.perf_counter()
+    model = load_model(model_name, backend)
+    load_s = time.perf_counter() - started
+    model.encode([SAMPLE_TEXT])
+
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        model.encode([SAMPLE_TEXT], convert_to_numpy=True)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    texts = [SAMPLE_TEXT] * max(repeat, batch_size)
+    started = time.perf_counter()
+    model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    throughput = len(texts) / (time.perf_counter() - started)
+
+    probes = normalize(model.encode(PARITY_PROBES, convert_to_numpy=True))
+    return {
+        'load_s': load_s,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'docs_per_s': throughput,
+        # ru_maxrss is in KiB on Linux
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'probes': probes.tolist(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=EMBEDDING_MODEL_NAME)
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--repeat', type=int, default=50, help="single-text encodes timed per backend")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--worker', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.model, args.worker, args.repeat, args.batch_size)))
+        return
+
+    results = {}
+    for backend in args.backends:
+        command = [sys.executable, '-m', 'benchmarks.bench_embedding_backends', '--worker', backend,
+                   '--model', args.model, '--repeat', str(args.repeat), '--batch-size', str(args.batch_size)]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{backend}: failed\n{completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    reference = np.array(results['torch']['probes']) if 'torch' in results else None
+    print(f"{args.model}, parity threshold {PARITY_THRESHOLD}")
+    print(f"{'backend':<11} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'docs/s':>8} {'RSS MB':>8} {'parity':>7}")
+    for backend, r in results.items():
+        parity = f"{np.min(np.sum(np.array(r['probes']) * reference, axis=1)):.4f}" if reference is not None else '-'
+        print(f"{backend:<11} {r['load_s']:>7.2f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['docs_per_s']:>8.1f} {r['rss_mb']:>8.0f} {parity:>7}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Compare the bulk match upsert against the former per-row loop.
+
+Runs against the configured database using an existing parsed resume and
+active jobs. Every round is rolled back, so no data is changed.
+
+    python -m benchmarks.bench_save_matches --matches 50 --rounds 20
+"""
+import argparse
+import time
+from models.database import get_db_connection
+from services.job_matcher import save_matches
+
+def save_matches_loop(cursor, rows):
+    """Previous implementation: one INSERT ... ON CONFLICT per match"""
+    for candidate_id, resume_id, match in rows:
+        cursor.execute("""
+            INSERT INTO matches_match 
+            (candidate_id, job_id, resume_id, match_score, matching_skills, 
+             skill_gaps, recommendation, status, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', NOW(), NOW())
+            ON CONFLICT (candidate_id, job_id, resume_id) 
+            DO UPDATE SET 
+                match_score = EXCLUDED.match_score,
+                matching_skills = EXCLUDED.matching_skills,
+                skill_gaps = EXCLUDED.skill_gaps,
+                recommendation = EXCLUDED.recommendation,
+                updated_at = NOW()
+        """, (candidate_id, match['job_id'], resume_id, float(match['match_score']),
+              match['matching_skills'], match['skill_gaps'], match['recommendation']))
+
+def build_rows(cursor, n_matches, n_resumes):
+    cursor.execute("SELECT id, user_id FROM resumes_resume ORDER BY id LIMIT %s", (n_resumes,))
+    resumes = cursor.fetchall()
+    cursor.execute("SELECT id FROM jobs_job ORDER BY id LIMIT %s", (n_matches,))
+    job_ids = [row[0] for row in cursor.fetchall()]
+    if not resumes or not job_ids:
+        raise SystemExit("Need at least one resume and one job in the database")
+    return [
+        (user_id, resume_id, {
+            'job_id': job_id,
+            'match_score': 42.0,
+            'matching_skills': 'python, sql',
+            'skill_gaps': 'docker',
+            'recommendation': 'Moderate match. Significant skill development needed.',
+        })
+        for resume_id, user_id in resumes
+        for job_id in job_ids
+    ]
+
+def time_rounds(conn, fn, rows, rounds):
+    timings = []
+    for _ in range(rounds):
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        fn(cursor, rows)
+        timings.append(time.perf_counter() - started)
+        cursor.close()
+        conn.rollback()
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--matches', type=int, default=50, help="matches per resume")
+    parser.add_argument('--resumes', type=int, default=1)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    rows = build_rows(cursor, args.matches, args.resumes)
+    cursor.close()
+
+    loop_ms = time_rounds(conn, save_matches_loop, rows, args.rounds)
+    bulk_ms = time_rounds(conn, save_matches, rows, args.rounds)
+    conn.close()
+
+    print(f"{len(rows)} matches, median of {args.rounds} rounds")
+    print(f"  per-row loop : {loop_ms:8.2f} ms")
+    print(f"  bulk upsert  : {bulk_ms:8.2f} ms  ({loop_ms / bulk_ms:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare parse throughput of the spaCy pipeline modes (SPACY_MODE).
+
+For every mode, times one ``nlp(text)`` call per document and one
+``nlp.pipe`` pass over all of them, and reports how often education
+extraction agrees with the full pipeline. Documents are PDF, DOCX
+or text files; without any, a synthetic resume is repeated.
+
+    python -m benchmarks.bench_spacy_modes uploads/*.pdf --repeat 20
+"""
+import argparse
+import time
+import docx
+from services.pdf_text import extract_pdf_text
+from services.resume_parser import SPACY_MODE_EXCLUDES, ResumeParser, load_nlp
+
+SAMPLE_RESUME = """Jane Doe. Senior data engineer with eight years of experience.
+Skills: Python, SQL, Apache Spark, Airflow, Docker, Kubernetes, AWS.
+2019 - present Lead Data Engineer at Acme Corp. Built streaming pipelines processing 2B events a day.
+2015 - 2019 Data Engineer at Initech. Migrated the warehouse to Redshift.
+Education: Master of Science in Computer Science, Stanford University, 2015.
+Bachelor of Engineering, University of Pune, 2013. Certified Kubernetes Administrator."""
+
+def load_texts(paths):
+    texts = []
+    for path in paths:
+        if path.lower().endswith('.pdf'):
+            with open(path, 'rb') as f:
+                texts.append(extract_pdf_text(f, path, path=path))
+        elif path.lower().endswith('.docx'):
+            texts.append('\n'.join(p.text for p in docx.Document(path).paragraphs if p.text.strip()))
+        else:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                texts.append(f.read())
+    return [text for text in texts if text.strip()] or [SAMPLE_RESUME]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', help="resume files to parse")
+    parser.add_argument('--repeat', type=int, default=20, help="times each document is parsed")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--modes', nargs='+', default=list(SPACY_MODE_EXCLUDES))
+    args = parser.parse_args()
+
+    texts = load_texts(args.paths) * args.repeat
+    chars = sum(len(text) for text in texts)
+    print(f"{len(texts)} documents, {chars / len(texts):.0f} characters on average")
+
+    results = {}
+    for mode in args.modes:
+        started = time.perf_counter()
+        nlp = load_nlp(mode)
+        load_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        docs = [nlp(text) for text in texts]
+        single = len(texts) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        list(nlp.pipe(texts, batch_size=args.batch_size, n_process=args.n_process))
+        piped = len(texts) / (time.perf_counter() - started)
+
+        education = [ResumeParser._extract_education(None, doc) for doc in docs]
+        results[mode] = (','.join(nlp.pipe_names), load_s, single, piped, education)
+
+    # Share of documents whose extracted education matches the full pipeline
+    reference = results.get('full', (None,) * 5)[4]
+    print(f"{'mode':<6} {'components':<40} {'load s':>7} {'docs/s':>8} {'pipe docs/s':>12} {'same education':>15}")
+    for mode, (components, load_s, single, piped, education) in results.items():
+        agreement = f"{sum(a == b for a, b in zip(education, reference)) / len(education):.0%}" if reference else '-'
+        print(f"{mode:<6} {components:<40} {load_s:>7.2f} {single:>8.1f} {piped:>12.1f} {agreement:>15}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Measure ML service startup: importing ``main`` and loading the models.
+
+Each run is a fresh interpreter, so nothing is cached in memory between
+runs. Reports the median time to import the app, which heavy libraries
+the import pulled in, and the time for the first model load and
+warm-up encode. Exits non-zero when the import exceeds ``--max-import-s``
+or pulls in a library that should only load with the models, so it can
+run in CI as a regression check.
+
+    python -m benchmarks.bench_startup --runs 5 --max-import-s 2
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Loaded with the models, never by importing the app
+HEAVY_MODULES = ('torch', 'spacy', 'sentence_transformers', 'transformers', 'onnxruntime')
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import main
+import_s = time.perf_counter() - started
+heavy = [name for name in %r if name in sys.modules]
+load_s = warm_up_s = None
+if %r:
+    started = time.perf_counter()
+    models = main.load_models()
+    load_s = time.perf_counter() - started
+    started = time.perf_counter()
+    models.embedder.encode_document(main.WARM_UP_TEXT)
+    warm_up_s = time.perf_counter() - started
+print(json.dumps({'import_s': import_s, 'heavy': heavy, 'load_s': load_s, 'warm_up_s': warm_up_s}))
+"""
+
+def run_once(load):
+    completed = subprocess.run([sys.executable, '-c', CHILD % (HEAVY_MODULES, load)],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-s', type=float, default=None, help="fail if the median import is slower")
+    parser.add_argument('--no-load', action='store_true', help="only time the import, skip loading the models")
+    args = parser.parse_args()
+
+    results = [run_once(not args.no_load) for _ in range(args.runs)]
+    import_s = statistics.median(r['import_s'] for r in results)
+    heavy = sorted({name for r in results for name in r['heavy']})
+    print(f"{args.runs} runs")
+    print(f"import main      {import_s:>8.3f} s (median)")
+    if not args.no_load:
+        print(f"load models      {statistics.median(r['load_s'] for r in results):>8.3f} s (median)")
+        print(f"first encode     {statistics.median(r['warm_up_s'] for r in results):>8.3f} s (median)")
+    print(f"heavy at import  {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if heavy:
+        failures.append(f"importing main loaded {', '.join(heavy)}")
+    if args.max_import_s is not None and import_s > args.max_import_s:
+        failures.append(f"import took {import_s:.3f}s, budget {args.max_import_s}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,165 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from services.resume_parser import ResumeParser
+from types import SimpleNamespace
+from typing import List, Optional
+from decouple import config
+from services.resume_parser import parser_fingerprint
 from services.job_matcher import JobMatcher
-from models.database import get_db_connection
-import shutil, os, json
+from services.embedding_service import get_embedding_service
+from services.worker_pool import WorkerPool, PoolSaturated
+from services import parse_worker
+from services.uploads import read_upload, resolve_shared_path, hash_file
+from services.parse_cache import ParseCache
+from models.database import pool_stats, close_pool
+from models.resume_store import lookup_resume_files, save_parsed_resumes
 
-app = FastAPI(title="Resume ML Service", version="1.0.0")
+# Worker pools: parsing and DB/numpy work in threads sharing one embedding model per process.
+# PARSE_POOL_KIND='process' isolates parsing in PARSE_WORKERS processes, but each one loads its own
+# spaCy pipeline and embedding model next to the API process's copy; only worth it with memory to spare.
+PARSE_POOL_KIND = config('PARSE_POOL_KIND', default='thread')
+PARSE_WORKERS = config('PARSE_WORKERS', default=2, cast=int)
+THREAD_WORKERS = config('THREAD_WORKERS', default=8, cast=int)
+MAX_QUEUE_DEPTH = config('MAX_QUEUE_DEPTH', default=32, cast=int)
+# Seconds between index snapshots (0 disables them)
+INDEX_SNAPSHOT_INTERVAL = config('INDEX_SNAPSHOT_INTERVAL', default=300, cast=int)
+# Seconds between index maintenance runs: embedding backfill, sync checks, rebuilds, training (0 disables them)
+INDEX_MAINTENANCE_INTERVAL = config('INDEX_MAINTENANCE_INTERVAL', default=60, cast=int)
+# Load and exercise the models in the background right after startup; otherwise the first request loads them
+WARM_UP_ON_STARTUP = config('WARM_UP_ON_STARTUP', default=True, cast=bool)
+# Upper bound of the backoff between failed warm-up attempts, in seconds
+WARM_UP_MAX_RETRY_DELAY = 60
+WARM_UP_TEXT = ("Senior Python developer with Django, PostgreSQL, Docker and AWS experience. "
+                "2018 - present Backend engineer. Master of Science in Computer Science, 2017.")
+
+# ----------------- MODELS -----------------
+# The embedding model, vector indexes and parse cache are built on first use or by the startup
+# warm-up instead of at import, so uvicorn binds the port right away; /ready says when they are loaded
+_models = None
+_models_lock = threading.Lock()
+_readiness = {'models': 'idle', 'warm_up': 'pending' if WARM_UP_ON_STARTUP else 'disabled',
+              'load_s': None, 'warm_up_s': None, 'error': None}
+
+def load_models():
+    """Models of this process, loaded once even if several threads ask at the same time"""
+    global _models
+    if _models is None:
+        with _models_lock:
+            if _models is None:
+                _readiness['models'] = 'loading'
+                started = time.perf_counter()
+                try:
+                    _models = _build_models()
+                except Exception as e:
+                    _readiness.update(models='failed', error=str(e))
+                    raise
+                _readiness.update(models='loaded', load_s=round(time.perf_counter() - started, 3), error=None)
+    return _models
+
+def _build_models():
+    # One embedding model per process, shared by the matcher and (in thread mode) the parser
+    embedder = get_embedding_service()
+    job_matcher = JobMatcher(embedder=embedder)
+    # Parse results keyed by file SHA-256, versioned by parser/model/taxonomy fingerprint
+    parse_cache = ParseCache(parser_fingerprint(embedder.fingerprint))
+    stale = parse_cache.purge_stale_versions()
+    if stale:
+        print(f"Purged parse cache versions: {', '.join(stale)}")
+    return SimpleNamespace(embedder=embedder, job_matcher=job_matcher, parse_cache=parse_cache)
+
+async def get_models():
+    """Loaded models; loading happens off the event loop"""
+    if _models is not None:
+        return _models
+    return await thread_pool.run(load_models)
+
+async def warm_up():
+    """Load the models and run one document through embedding and parsing, retrying until it succeeds"""
+    _readiness['warm_up'] = 'running'
+    started = time.perf_counter()
+    delay = 1
+    while True:
+        try:
+            models = await get_models()
+            await thread_pool.run(models.embedder.encode_document, WARM_UP_TEXT)
+            # In process mode this starts every parse process, each loading its own parser
+            await asyncio.gather(*(parse_pool.run(parse_worker.warm_up, WARM_UP_TEXT)
+                                   for _ in range(parse_pool.max_workers if PARSE_POOL_KIND == 'process' else 1)))
+        except Exception as e:
+            _readiness.update(warm_up='retrying', error=str(e))
+            print(f"[Warning] Model warm-up failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARM_UP_MAX_RETRY_DELAY)
+            continue
+        _readiness.update(warm_up='done', warm_up_s=round(time.perf_counter() - started, 3), error=None)
+        print(f"Models warmed up in {_readiness['warm_up_s']}s")
+        return
+
+def is_ready():
+    """Models loaded and warmed up, or lazy loading was chosen (WARM_UP_ON_STARTUP off).
+
+    Once a warm-up attempt has failed, loaded models are enough: they may
+    have been loaded by a request since, and the warm-up keeps retrying.
+    """
+    if _readiness['warm_up'] == 'disabled':
+        return _readiness['models'] != 'failed'
+    return _readiness['models'] == 'loaded' and _readiness['warm_up'] in ('done', 'retrying')
+
+async def snapshot_indexes_periodically():
+    """Persist the vector indexes so restarting workers map them instead of reloading from the DB"""
+    while True:
+        await asyncio.sleep(INDEX_SNAPSHOT_INTERVAL)
+        if _models is None:
+            continue
+        try:
+            written = await thread_pool.run(_models.job_matcher.snapshot_indexes)
+            if written:
+                print(f"Wrote index snapshots: {', '.join(written)}")
+        except Exception as e:
+            print(f"[Warning] Index snapshot failed: {e}")
+
+async def maintain_indexes_periodically():
+    """Keep the slow index upkeep (see JobMatcher.maintain_indexes) off the request path"""
+    while True:
+        if _models is None:
+            await asyncio.sleep(1)
+            continue
+        try:
+            report = await thread_pool.run(_models.job_matcher.maintain_indexes)
+            if report['embedded'] or report['trained'] or report['rebuilt']:
+                print(f"Index maintenance: {report}")
+        except Exception as e:
+            print(f"[Warning] Index maintenance failed: {e}")
+        await asyncio.sleep(INDEX_MAINTENANCE_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Not awaited: the port is served (and /health answers) while models load
+    warming = asyncio.create_task(warm_up()) if WARM_UP_ON_STARTUP else None
+    snapshots = asyncio.create_task(snapshot_indexes_periodically()) if INDEX_SNAPSHOT_INTERVAL > 0 else None
+    maintenance = asyncio.create_task(maintain_indexes_periodically()) if INDEX_MAINTENANCE_INTERVAL > 0 else None
+    yield
+    if warming:
+        warming.cancel()
+    if maintenance:
+        maintenance.cancel()
+    if snapshots:
+        snapshots.cancel()
+    if snapshots and _models is not None:
+        try:
+            _models.job_matcher.snapshot_indexes()
+        except Exception as e:
+            print(f"[Warning] Index snapshot failed: {e}")
+    parse_pool.shutdown()
+    thread_pool.shutdown()
+    close_pool()
+
+app = FastAPI(title="Resume ML Service", version="1.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -17,88 +170,249 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-resume_parser = ResumeParser()
-job_matcher = JobMatcher()
+if PARSE_POOL_KIND == 'process':
+    # Each parse process loads its own parser; the API process does not need one
+    parse_pool = WorkerPool('parse', PARSE_WORKERS, MAX_QUEUE_DEPTH, kind='process',
+                            initializer=parse_worker.init_worker)
+else:
+    # The parser is built on first use and shares this process's embedding model
+    parse_pool = WorkerPool('parse', PARSE_WORKERS, MAX_QUEUE_DEPTH)
+thread_pool = WorkerPool('io', THREAD_WORKERS, MAX_QUEUE_DEPTH)
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    """Backpressure: tell clients to retry instead of queueing without bound"""
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
 
 # ----------------- PARSE RESUME -----------------
 @app.post("/parse-resume/")
-async def parse_resume(file: UploadFile = File(None), resume_id: int = Form(...)):
+async def parse_resume(file: UploadFile = File(None), resume_id: int = Form(...),
+                       file_path: Optional[str] = Form(None)):
+    """Parse an uploaded file, a shared-storage path reference, or the resume's stored file"""
     try:
         if file:
-            file_path = os.path.join(UPLOAD_DIR, f"{resume_id}_{file.filename}")
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # Streamed body: kept in memory, never written to disk
+            data, content_hash = await read_upload(file)
         else:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT file FROM resumes_resume WHERE id = %s", (resume_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            if not result:
-                raise HTTPException(status_code=404, detail="Resume not found")
-            file_path = result[0]
-
-        parsed_data = resume_parser.parse(file_path)
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE resumes_resume 
-            SET parsed_text=%s,
-                extracted_skills=%s,
-                extracted_education=%s,
-                extracted_experience=%s,
-                embedding_vector=%s,
-                is_parsed=TRUE
-            WHERE id=%s
-        """, (
-            parsed_data['text'],
-            parsed_data['skills'],
-            parsed_data['education'],
-            parsed_data['experience'],
-            parsed_data['embedding'],
-            resume_id
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"status": "success", "resume_id": resume_id, "parsed_data": parsed_data}
+            if file_path:
+                local_path = resolve_shared_path(file_path, require_shared=True)
+            else:
+                paths = await thread_pool.run(lookup_resume_files, [resume_id])
+                if resume_id not in paths:
+                    raise HTTPException(status_code=404, detail="Resume not found")
+                local_path = resolve_shared_path(paths[resume_id])
+            content_hash = await thread_pool.run(hash_file, local_path)
+
+        # Identical bytes were parsed by this parser version before: skip extraction, NLP and embedding
+        parse_cache = (await get_models()).parse_cache
+        parsed_data = await thread_pool.run(parse_cache.get, content_hash)
+        cached = parsed_data is not None
+        if not cached:
+            if file:
+                parsed_data = await parse_pool.run(parse_worker.parse_buffer, data, file.filename)
+            else:
+                parsed_data = await parse_pool.run(parse_worker.parse_file, local_path)
+            parsed_data['content_hash'] = content_hash
+        await thread_pool.run(save_parsed_resumes, [(resume_id, parsed_data)])
+        if not cached:
+            await thread_pool.run(parse_cache.put, content_hash, parsed_data)
+
+        return {"status": "success", "resume_id": resume_id, "parsed_data": parsed_data, "cached": cached}
+
+    except (HTTPException, PoolSaturated):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ----------------- BATCH PARSE RESUMES -----------------
+@app.post("/parse-resumes/batch")
+async def parse_resumes_batch(files: List[UploadFile] = File(None), resume_ids: List[int] = Form(...)):
+    """Parse many resumes at once; without files the stored paths are looked up"""
+    try:
+        # A bad file fails only its own resume: unreadable ones are reported, the rest parsed
+        sources, hashes, errors = {}, {}, []
+        if files:
+            if len(files) != len(resume_ids):
+                raise HTTPException(status_code=400, detail="files and resume_ids must have the same length")
+            for resume_id, upload in zip(resume_ids, files):
+                try:
+                    data, hashes[resume_id] = await read_upload(upload)
+                except HTTPException as e:
+                    errors.append({"resume_ids": [resume_id], "message": e.detail})
+                    continue
+                sources[resume_id] = (data, upload.filename)
+        else:
+            paths = await thread_pool.run(lookup_resume_files, resume_ids)
+            for resume_id, path in paths.items():
+                try:
+                    local_path = resolve_shared_path(path)
+                    hashes[resume_id] = await thread_pool.run(hash_file, local_path)
+                except HTTPException as e:
+                    if e.status_code != 404:
+                        errors.append({"resume_ids": [resume_id], "message": e.detail})
+                    continue
+                sources[resume_id] = local_path
+
+        failed_ids = {resume_id for error in errors for resume_id in error["resume_ids"]}
+        found_ids = [resume_id for resume_id in resume_ids if resume_id in sources]
+        missing_ids = [resume_id for resume_id in resume_ids
+                       if resume_id not in sources and resume_id not in failed_ids]
+
+        parse_cache = (await get_models()).parse_cache
+        results = {}
+        for resume_id in found_ids:
+            cached = await thread_pool.run(parse_cache.get, hashes[resume_id])
+            if cached is not None:
+                results[resume_id] = cached
+        parse_ids = [resume_id for resume_id in found_ids if resume_id not in results]
 
+        if parse_ids:
+            parsed = await parse_pool.run(parse_worker.parse_files, [sources[resume_id] for resume_id in parse_ids])
+            for resume_id, result in zip(parse_ids, parsed):
+                result['content_hash'] = hashes[resume_id]
+                results[resume_id] = result
+        if results:
+            await thread_pool.run(save_parsed_resumes, [(resume_id, results[resume_id]) for resume_id in found_ids])
+            for resume_id in parse_ids:
+                await thread_pool.run(parse_cache.put, hashes[resume_id], results[resume_id])
+
+        return {"status": "success", "parsed": found_ids, "cached": [i for i in found_ids if i not in parse_ids],
+                "missing": missing_ids, "errors": errors}
+
+    except (HTTPException, PoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ----------------- PARSE CACHE -----------------
+class InvalidateCacheRequest(BaseModel):
+    content_hash: Optional[str] = None
+
+@app.post("/parse-cache/invalidate")
+async def invalidate_parse_cache(request: InvalidateCacheRequest):
+    """Drop one cached parse, or all of them (e.g. after editing the skill taxonomy in place)"""
+    try:
+        parse_cache = (await get_models()).parse_cache
+        removed = await thread_pool.run(parse_cache.invalidate, request.content_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", "removed": removed}
+
 # ----------------- FIND MATCHES -----------------
 class MatchRequest(BaseModel):
     resume_id: int
     top_k: int = 10
+    # Hard filters applied before ranking
+    experience_level: Optional[List[str]] = None
+    job_type: Optional[List[str]] = None
+    location: Optional[str] = None
 
 @app.post("/find-matches/")
 async def find_matches(request: MatchRequest):
     try:
         top_k = min(max(request.top_k, 1), 50)
-        matches = job_matcher.find_matches(resume_id=request.resume_id, top_k=top_k)
+        filters = {
+            'experience_level': request.experience_level,
+            'job_type': request.job_type,
+            'location': request.location,
+        }
+        timings = {}
+        models = await get_models()
+        matches = await thread_pool.run(models.job_matcher.find_matches, resume_id=request.resume_id, top_k=top_k,
+                                        filters=filters, timings=timings)
         if not matches:
             return {
                 "status": "success",
                 "resume_id": request.resume_id,
                 "matches": [],
-                "message": "No matches found or resume not parsed yet"
+                "message": "No matches found or resume not parsed yet",
+                "timings_ms": timings
             }
-        return {"status": "success", "resume_id": request.resume_id, "matches": matches}
+        return {"status": "success", "resume_id": request.resume_id, "matches": matches, "timings_ms": timings}
+    except PoolSaturated:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# ----------------- FIND CANDIDATES -----------------
+class CandidatesRequest(BaseModel):
+    job_id: int
+    limit: int = 20
+    offset: int = 0
+
+@app.post("/find-candidates/")
+async def find_candidates(request: CandidatesRequest):
+    """Best parsed resumes for a job, ranked over the whole resume index and paginated"""
+    try:
+        limit = min(max(request.limit, 1), 100)
+        offset = max(request.offset, 0)
+        timings = {}
+        models = await get_models()
+        result = await thread_pool.run(models.job_matcher.find_candidates, job_id=request.job_id, limit=limit,
+                                       offset=offset, timings=timings)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        total, candidates = result
+        return {"status": "success", "job_id": request.job_id, "total": total, "offset": offset,
+                "candidates": candidates, "timings_ms": timings}
+    except (HTTPException, PoolSaturated):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ----------------- REMATCH JOB -----------------
+class RematchRequest(BaseModel):
+    job_id: int
+
+@app.post("/rematch-job/")
+async def rematch_job(request: RematchRequest):
+    """Refresh stored matches of one job after it changed; prunes pending matches of inactive jobs"""
+    try:
+        models = await get_models()
+        result = await thread_pool.run(models.job_matcher.rematch_job, job_id=request.job_id)
+        return {"status": "success", "job_id": request.job_id, **result}
+    except PoolSaturated:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ----------------- EMBED JOBS -----------------
+class EmbedJobsRequest(BaseModel):
+    job_ids: Optional[List[int]] = None
+    force: bool = False
+
+@app.post("/embed-jobs/")
+async def embed_jobs(request: EmbedJobsRequest):
+    """(Re)compute stored embeddings; unchanged jobs are skipped by content hash"""
+    try:
+        models = await get_models()
+        result = await thread_pool.run(models.job_matcher.embed_jobs, job_ids=request.job_ids, force=request.force)
+        return {"status": "success", **result}
+    except PoolSaturated:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ----------------- HEALTH CHECK -----------------
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    """Liveness: the process serves requests, whether or not the models are loaded yet"""
+    return {
+        "status": "healthy",
+        "models": _readiness['models'],
+        "pools": {"parse": parse_pool.stats(), "io": thread_pool.stats()},
+        "db_pool": pool_stats(),
+        "parse_cache": _models.parse_cache.stats() if _models is not None else None,
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once the models are loaded and warmed up, 503 before (route traffic only on 200)"""
+    ready = is_ready()
+    content = {"status": "ready" if ready else "not ready", **_readiness}
+    return JSONResponse(status_code=200 if ready else 503, content=content)
 
 if __name__ == "__main__":
     import uvicorn
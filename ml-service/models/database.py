@@ -1,12 +1,155 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import pool as pg_pool
 from decouple import config
 
-def get_db_connection():
-    """Create database connection"""
-    return psycopg2.connect(
+DB_POOL_MIN = config('DB_POOL_MIN', default=1, cast=int)
+DB_POOL_MAX = config('DB_POOL_MAX', default=10, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10.0, cast=float)  # seconds to wait for a free connection
+DB_POOL_HEALTHCHECK_INTERVAL = config('DB_POOL_HEALTHCHECK_INTERVAL', default=30.0, cast=float)
+
+def _connection_params():
+    return dict(
         dbname=config('DB_NAME', default='resume_matcher_db'),
         user=config('DB_USER', default='postgres'),
         password=config('DB_PASSWORD', default='root'),
         host=config('DB_HOST', default='localhost'),
         port=config('DB_PORT', default='5432')
-    )
\ No newline at end of file
+    )
+
+def get_db_connection():
+    """Create database connection"""
+    return psycopg2.connect(**_connection_params())
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became available within DB_POOL_TIMEOUT"""
+
+class ConnectionPool:
+    """Thread-safe psycopg2 connection pool.
+
+    Checkout blocks (up to ``timeout``) instead of failing when all
+    ``maxconn`` connections are in use. Connections idle for longer than
+    ``healthcheck_interval`` are pinged before being handed out and
+    replaced if they are dead.
+    """
+
+    def __init__(self, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, timeout=DB_POOL_TIMEOUT,
+                 healthcheck_interval=DB_POOL_HEALTHCHECK_INTERVAL):
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, **_connection_params())
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        self._lock = threading.Lock()
+        self._metrics = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'discarded': 0,
+            'in_use': 0,
+            'wait_seconds_total': 0.0,
+        }
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; commit on success, roll back on error"""
+        conn = self._checkout()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self._checkin(conn)
+
+    def stats(self):
+        with self._lock:
+            return {**self._metrics, 'max': self.maxconn}
+
+    def close(self):
+        self._pool.closeall()
+
+    # ---------------- Internals ----------------
+    def _checkout(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._metrics['timeouts'] += 1
+            raise PoolTimeout(f"No database connection available after {self.timeout}s")
+        try:
+            conn = self._healthy_connection()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['in_use'] += 1
+            self._metrics['wait_seconds_total'] += time.monotonic() - started
+        return conn
+
+    def _healthy_connection(self):
+        for _ in range(self.maxconn + 1):
+            conn = self._pool.getconn()
+            idle = time.monotonic() - self._last_used.get(id(conn), 0)
+            if not conn.closed and idle < self.healthcheck_interval:
+                return conn
+            if not conn.closed:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    conn.rollback()
+                    return conn
+                except psycopg2.Error:
+                    pass
+            # Dead connection: drop it and let the pool open a fresh one
+            self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+            with self._lock:
+                self._metrics['discarded'] += 1
+        raise psycopg2.OperationalError("Could not obtain a healthy database connection")
+
+    def _checkin(self, conn):
+        try:
+            self._last_used[id(conn)] = time.monotonic()
+            self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            with self._lock:
+                self._metrics['in_use'] -= 1
+            self._slots.release()
+
+
+# ---------------- Process-wide pool ----------------
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return this process's pool, creating it on first use (and after fork)"""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool()
+                _pool_pid = os.getpid()
+    return _pool
+
+def db_connection():
+    """Shortcut for ``get_pool().connection()``"""
+    return get_pool().connection()
+
+def pool_stats():
+    """Metrics of this process's pool, or None if it was never used"""
+    return _pool.stats() if _pool is not None and _pool_pid == os.getpid() else None
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
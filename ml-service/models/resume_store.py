@@ -0,0 +1,35 @@
+from psycopg2.extras import execute_values
+from models.database import db_connection
+from services.vector_codec import encode_vector
+
+def lookup_resume_files(resume_ids):
+    """Map resume id -> stored file path"""
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT id, file FROM resumes_resume WHERE id = ANY(%s)", (list(resume_ids),))
+        return dict(cursor.fetchall())
+
+def save_parsed_resumes(results):
+    """Write parse results for one or many resumes in a single UPDATE"""
+    with db_connection() as conn, conn.cursor() as cursor:
+        execute_values(cursor, """
+            UPDATE resumes_resume AS r
+            SET parsed_text = v.parsed_text,
+                extracted_skills = v.skills,
+                extracted_education = v.education,
+                extracted_experience = v.experience,
+                embedding = v.embedding::bytea,
+                embedding_model = v.model,
+                embedding_dim = v.dim::integer,
+                content_hash = COALESCE(v.content_hash, r.content_hash),
+                is_parsed = TRUE,
+                parse_status = 'parsed',
+                parse_error = '',
+                updated_at = NOW()
+            FROM (VALUES %s) AS v (id, parsed_text, skills, education, experience, embedding, model, dim, content_hash)
+            WHERE r.id = v.id
+        """, [
+            (resume_id, data['text'], data['skills'], data['education'], data['experience'],
+             encode_vector(data['embedding']) if data['embedding'] else None,
+             data.get('embedding_model', ''), len(data['embedding']) or None, data.get('content_hash'))
+            for resume_id, data in results
+        ], page_size=max(len(results), 1))
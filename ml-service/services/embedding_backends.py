@@ -0,0 +1,130 @@
+"""Inference backends for the embedding model.
+
+Every backend returns a ``SentenceTransformer``, so ``encode`` and the
+tokenizer behave the same whichever one is used:
+
+- ``torch``: the FP32 PyTorch model, on the device sentence-transformers picks (GPU if available).
+- ``torch-int8``: PyTorch with dynamic int8 quantization of the Linear layers.
+- ``onnx``: ONNX Runtime, FP32.
+- ``onnx-int8``: ONNX Runtime with a dynamically int8-quantized export.
+
+The ONNX backends need ``sentence-transformers[onnx]`` (optimum and
+onnxruntime). sentence-transformers (and with it torch) is imported on
+the first load, not with this module. The other backends run on the CPU.
+Quantized models must match FP32 embeddings to a cosine similarity of at
+least PARITY_THRESHOLD; if one does not, the FP32 model is used instead.
+"""
+import fcntl
+import os
+import shutil
+import tempfile
+import numpy as np
+from decouple import config
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+# Quantized ONNX exports are written here once and reused by every worker
+EMBEDDING_ONNX_DIR = config('EMBEDDING_ONNX_DIR', default='onnx_models')
+# ONNX Runtime quantization preset matching the CPU: 'avx512_vnni', 'avx512', 'avx2' or 'arm64'
+EMBEDDING_ONNX_QUANTIZATION = config('EMBEDDING_ONNX_QUANTIZATION', default='avx2')
+PARITY_THRESHOLD = 0.99
+
+# Resume- and job-like probe texts for the parity check
+PARITY_PROBES = [
+    "Senior Python developer with Django, PostgreSQL and Celery experience",
+    "Data scientist skilled in machine learning, pandas, scikit-learn and TensorFlow",
+    "Frontend engineer building React and TypeScript single page applications",
+    "DevOps engineer: Kubernetes, Docker, Terraform, AWS and CI/CD pipelines",
+    "Master of Science in Computer Science, Stanford University, 2015",
+    "2018 - present Lead backend engineer at a fintech startup, payments platform",
+    "We are hiring a mid-level Java developer for a remote full-time position",
+    "Registered nurse with five years of ICU experience and BLS certification",
+]
+
+def load_model(model_name, backend='torch'):
+    """Load ``model_name`` for one of the BACKENDS"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    from sentence_transformers import SentenceTransformer
+
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+    if backend == 'onnx':
+        return SentenceTransformer(model_name, device='cpu', backend='onnx')
+    if backend == 'torch-int8':
+        return _quantize_torch(model_name)
+    return _load_quantized_onnx(model_name)
+
+def embedding_parity(model, reference, texts=PARITY_PROBES):
+    """Smallest cosine similarity between two models' embeddings of the same texts"""
+    a = normalize(model.encode(texts, convert_to_numpy=True))
+    b = normalize(reference.encode(texts, convert_to_numpy=True))
+    return float(np.min(np.sum(a * b, axis=1)))
+
+def normalize(vectors):
+    """Scale rows to unit length"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def _quantize_torch(model_name):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(model_name, device='cpu')
+    quantized = torch.quantization.quantize_dynamic(reference, {torch.nn.Linear}, dtype=torch.qint8)
+    parity = embedding_parity(quantized, reference)
+    if parity < PARITY_THRESHOLD:
+        print(f"[Warning] torch-int8 {model_name} parity {parity:.4f} < {PARITY_THRESHOLD}, using FP32")
+        return reference
+    return quantized
+
+def _load_quantized_onnx(model_name):
+    from sentence_transformers import SentenceTransformer
+
+    directory = os.path.join(EMBEDDING_ONNX_DIR, model_name.replace('/', '__'))
+    file_name = f"onnx/model_qint8_{EMBEDDING_ONNX_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(directory, file_name)) and not _export_once(model_name, directory, file_name):
+        return SentenceTransformer(model_name, device='cpu')
+    return SentenceTransformer(directory, device='cpu', backend='onnx', model_kwargs={'file_name': file_name})
+
+def _export_once(model_name, directory, file_name):
+    """Export the quantized model into ``directory`` unless another worker did; False if it failed parity.
+
+    Workers starting together serialize on a lock file; the export is
+    written to a temporary directory and renamed into place, so nobody
+    loads a half-written model.
+    """
+    os.makedirs(EMBEDDING_ONNX_DIR, exist_ok=True)
+    with open(f"{directory}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if os.path.exists(os.path.join(directory, file_name)):
+            return True
+        staging = tempfile.mkdtemp(prefix='.export-', dir=EMBEDDING_ONNX_DIR)
+        try:
+            parity = export_quantized_onnx(model_name, staging)
+            if parity < PARITY_THRESHOLD:
+                print(f"[Warning] onnx-int8 {model_name} parity {parity:.4f} < {PARITY_THRESHOLD}, using FP32")
+                return False
+            if os.path.exists(directory):
+                # Export for another quantization preset: replaced whole, the old one is moved aside first
+                retired = tempfile.mkdtemp(prefix='.retired-', dir=EMBEDDING_ONNX_DIR)
+                os.replace(directory, os.path.join(retired, 'model'))
+                shutil.rmtree(retired, ignore_errors=True)
+            os.replace(staging, directory)
+            return True
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+def export_quantized_onnx(model_name, directory, quantization=EMBEDDING_ONNX_QUANTIZATION):
+    """Export ``model_name`` to ONNX with int8 dynamic quantization under ``directory``.
+
+    Returns the parity of the quantized model with the FP32 PyTorch model.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    onnx_model = SentenceTransformer(model_name, device='cpu', backend='onnx')
+    onnx_model.save_pretrained(directory)
+    export_dynamic_quantized_onnx_model(onnx_model, quantization, directory, file_suffix=f"qint8_{quantization}")
+
+    quantized = SentenceTransformer(directory, device='cpu', backend='onnx',
+                                    model_kwargs={'file_name': f"onnx/model_qint8_{quantization}.onnx"})
+    return embedding_parity(quantized, SentenceTransformer(model_name, device='cpu'))
@@ -0,0 +1,120 @@
+import copy
+import threading
+import numpy as np
+from decouple import config
+from services.embedding_backends import load_model
+
+EMBEDDING_MODEL_NAME = config('EMBEDDING_MODEL', default='all-MiniLM-L6-v2')
+# Inference backend: 'torch', 'torch-int8', 'onnx' or 'onnx-int8' (see services.embedding_backends)
+EMBEDDING_BACKEND = config('EMBEDDING_BACKEND', default='torch')
+# Long documents are embedded as overlapping token windows pooled into one vector
+EMBED_POOLING = config('EMBED_POOLING', default='mean')  # 'mean' or 'max'
+EMBED_MAX_CHUNKS = config('EMBED_MAX_CHUNKS', default=8, cast=int)
+EMBED_CHUNK_OVERLAP = config('EMBED_CHUNK_OVERLAP', default=32, cast=int)
+# Generous upper bound on characters per token, used to cut text that could never fit in the chunk cap
+MAX_CHARS_PER_TOKEN = 8
+
+class EmbeddingService:
+    """Thin wrapper around one loaded SentenceTransformer"""
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, pooling=EMBED_POOLING, max_chunks=EMBED_MAX_CHUNKS,
+                 overlap=EMBED_CHUNK_OVERLAP, backend=EMBEDDING_BACKEND):
+        if pooling not in ('mean', 'max'):
+            raise ValueError(f"Unknown pooling {pooling!r}, expected 'mean' or 'max'")
+        self.model_name = model_name
+        self.backend = backend
+        self.model = load_model(model_name, backend)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.pooling = pooling
+        self.max_chunks = max(max_chunks, 1)
+        # Room for the [CLS]/[SEP] tokens the model adds to every window
+        self.window = max(self.model.max_seq_length - 2, 1)
+        self.overlap = min(max(overlap, 0), self.window // 2)
+        # Stored with every vector: changing the model or the chunking makes old vectors stale.
+        # The backend is left out, quantized backends reproduce FP32 vectors within the parity threshold.
+        self.fingerprint = f"{model_name}:{pooling}{self.max_chunks}x{self.window}-{self.overlap}"
+        self._local = threading.local()
+
+    def encode(self, text):
+        """Embed one text as a 1-d float32 array (truncated at the model's max sequence length)"""
+        return self.model.encode(text, convert_to_numpy=True)
+
+    def encode_batch(self, texts, batch_size=32):
+        """Embed many texts in batched forward passes, returns an (n, dim) array"""
+        return self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+
+    def encode_document(self, text):
+        """Embed one possibly long text, see ``encode_documents``"""
+        return self.encode_documents([text])[0]
+
+    def encode_documents(self, texts, batch_size=32):
+        """Embed long texts without losing what lies past the model's max sequence length.
+
+        Each text is split into overlapping token windows (at most
+        ``max_chunks``), the windows of all texts are encoded in one batched
+        call, and each text's windows are mean- or max-pooled into one
+        normalized vector. Returns an ``(n, dim)`` float32 array.
+        """
+        chunks, owners = [], []
+        for i, text in enumerate(texts):
+            windows = self._chunk(text)
+            chunks.extend(windows)
+            owners.extend([i] * len(windows))
+        vectors = self.model.encode(chunks, batch_size=batch_size, convert_to_numpy=True)
+        owners = np.asarray(owners, dtype=np.intp)
+
+        if self.pooling == 'max':
+            pooled = np.full((len(texts), self.dimension), -np.inf, dtype=np.float32)
+            np.maximum.at(pooled, owners, vectors)
+        else:
+            pooled = np.zeros((len(texts), self.dimension), dtype=np.float32)
+            np.add.at(pooled, owners, vectors)
+            pooled /= np.bincount(owners, minlength=len(texts))[:, None]
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.where(norms > 0, norms, 1)
+
+    def _chunk(self, text):
+        """Split text into windows of at most ``window`` tokens, overlapping by ``overlap``"""
+        # Tokens past the chunk cap are never embedded; don't pay to tokenize them
+        text = text[:self.max_chunks * self.window * MAX_CHARS_PER_TOKEN]
+        offsets = self._tokenizer()(text, add_special_tokens=False, return_offsets_mapping=True,
+                                    verbose=False)['offset_mapping']
+        if len(offsets) <= self.window:
+            return [text]
+
+        windows = []
+        for start in range(0, len(offsets), self.window - self.overlap):
+            stop = min(start + self.window, len(offsets))
+            windows.append(text[offsets[start][0]:offsets[stop - 1][1]])
+            if stop == len(offsets) or len(windows) == self.max_chunks:
+                break
+        return windows
+
+    def _tokenizer(self):
+        """This thread's copy of the model's tokenizer.
+
+        HF fast tokenizers raise "Already borrowed" when one instance is called
+        from several threads, and ``_chunk`` runs on every request thread. The
+        shared instance is left to ``model.encode``.
+        """
+        tokenizer = getattr(self._local, 'tokenizer', None)
+        if tokenizer is None:
+            tokenizer = self._local.tokenizer = copy.deepcopy(self.model.tokenizer)
+        return tokenizer
+
+
+# ---------------- Model registry ----------------
+_services = {}
+_lock = threading.Lock()
+
+def get_embedding_service(model_name=None):
+    """Return the process-wide EmbeddingService for a model, loading it once"""
+    model_name = model_name or EMBEDDING_MODEL_NAME
+    service = _services.get(model_name)
+    if service is None:
+        with _lock:
+            service = _services.get(model_name)
+            if service is None:
+                service = EmbeddingService(model_name)
+                _services[model_name] = service
+    return service
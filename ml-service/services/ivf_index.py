@@ -0,0 +1,134 @@
+import numpy as np
+from services.job_index import JobIndex
+
+class IVFJobIndex(JobIndex):
+    """Inverted-file (IVF) approximate variant of ``JobIndex``.
+
+    Jobs are clustered around ``nlist`` spherical k-means centroids; a query
+    only scores the jobs in its ``nprobe`` closest clusters. ``nprobe`` is
+    the recall-vs-latency knob. Below ``min_size`` rows, and until the
+    owner calls ``train`` (see ``needs_training``), the index behaves
+    exactly like ``JobIndex``.
+    """
+
+    def __init__(self, dim=384, nlist=0, nprobe=8, min_size=20000,
+                 train_iterations=10, initial_capacity=1024):
+        self.nlist = nlist  # 0 = sqrt(N), chosen at training time
+        self.nprobe = nprobe
+        self.min_size = min_size
+        self.train_iterations = train_iterations
+        self._centroids = None
+        self._trained_size = 0
+        self._assign = np.zeros(initial_capacity, dtype=np.int32)
+        super().__init__(dim=dim, initial_capacity=initial_capacity)
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    @property
+    def needs_training(self):
+        if self._size < self.min_size:
+            return False
+        return not self.is_trained or self._size > 2 * self._trained_size
+
+    # ---------------- Mutation ----------------
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self._centroids = None
+            self._trained_size = 0
+
+    def upsert_many(self, job_ids, vectors, skills=None, facets=None, metadata=None):
+        with self.lock:
+            rows = super().upsert_many(job_ids, vectors, skills, facets, metadata)
+            if self.is_trained:
+                self._assign[rows] = np.argmax(self._matrix[rows] @ self._centroids.T, axis=1)
+            return rows
+
+    def remove(self, job_id):
+        with self.lock:
+            row = self._positions.get(job_id)
+            last = self._size - 1
+            if row is not None and row != last:
+                self._assign[row] = self._assign[last]
+            return super().remove(job_id)
+
+    def train(self, seed=0):
+        """Cluster the current vectors and assign every row to a list.
+
+        k-means runs on a sample copied under the lock, so queries go on
+        while it iterates; only the final assignment holds the lock.
+        """
+        with self.lock:
+            size = self._size
+            if size == 0:
+                return
+            nlist = min(self.nlist or int(round(np.sqrt(size))), size)
+            rng = np.random.default_rng(seed)
+            sample = self._matrix[rng.choice(size, min(size, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        with self.lock:
+            # Rows may have changed meanwhile: assign whatever is live now
+            self._centroids = centroids.astype(np.float32)
+            self._trained_size = size
+            for start in range(0, self._size, 16384):
+                block = self._matrix[start:min(start + 16384, self._size)]
+                self._assign[start:start + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+
+    # ---------------- Query ----------------
+    def candidates(self, query, n=None, filters=None):
+        """The ``n`` most similar rows passing ``filters`` in the ``nprobe`` nearest clusters.
+
+        Below ``min_size``, or before training, every row is scored, as in ``JobIndex``.
+        """
+        if self._size < self.min_size or not self.is_trained:
+            return super().candidates(query, n, filters)
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if query.size != self.dim:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = self._normalize(query)
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = self.top_k(self._centroids @ query, nprobe)
+        rows = np.flatnonzero(np.isin(self._assign[:self._size], probes))
+        rows, similarities = self._filter(rows, self._matrix[rows] @ query, filters)
+        if n is not None and len(rows) > n:
+            best = np.argpartition(-similarities, n - 1)[:n]
+            rows, similarities = rows[best], similarities[best]
+        return rows, similarities
+
+    # ---------------- Persistence ----------------
+    def _extra_state(self):
+        if not self.is_trained:
+            return {}
+        return {
+            'centroids': self._centroids,
+            'assign': self._assign[:self._size],
+            'trained_size': np.array(self._trained_size),
+        }
+
+    def _load_extra_state(self, state):
+        if 'centroids' in state:
+            self._centroids = state['centroids']
+            self._assign[:self._size] = state['assign']
+            self._trained_size = int(state['trained_size'])
+        else:
+            self._centroids = None
+            self._trained_size = 0
+
+    def _resize_columns(self, capacity):
+        super()._resize_columns(capacity)
+        assign = np.zeros(capacity, dtype=np.int32)
+        assign[:self._size] = self._assign[:self._size]
+        self._assign = assign
@@ -0,0 +1,424 @@
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+import numpy as np
+
+# Bump when the snapshot layout changes; older snapshots then fail to load and get rebuilt
+SNAPSHOT_FORMAT = 1
+# Zero rows written after the live ones, so rows added after a restart land in
+# the mapped file (copy-on-write) instead of forcing a private copy of the matrix
+SNAPSHOT_MIN_HEADROOM = 1024
+
+class JobIndex:
+    """In-memory index of active job embeddings.
+
+    All vectors live in one contiguous, L2-normalized float32 matrix so a
+    query is a single matrix-vector product. Row ``i`` of the matrix
+    belongs to ``ids[i]``; per-job metadata is kept in parallel lists.
+    Each job's skills are a row of uint64 bitset words, so skill overlap
+    with a query set is also one vectorized operation; skills without a
+    bit (``other_skills`` metadata) are counted alongside and compared by
+    name. Categorical facets (experience level, job type, ...) are int32
+    code columns that hard filters test with ``np.isin``.
+    """
+
+    def __init__(self, dim=384, initial_capacity=1024):
+        self.dim = dim
+        self.lock = threading.RLock()
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(initial_capacity, dtype=np.int64)
+        self._size = 0
+        self._positions = {}   # job_id -> row
+        self._metadata = []    # row -> dict
+        self._skills = np.zeros((initial_capacity, 1), dtype=np.uint64)
+        self._skill_counts = np.zeros(initial_capacity, dtype=np.int32)  # bits + other_skills
+        self.skill_vocabulary = []  # skill id of each bit position, persisted with the index
+        self._facets = {}        # facet name -> int32 code per row, -1 = unset
+        self._facet_values = {}  # facet name -> distinct values, indexed by code
+        self._facet_codes = {}   # facet name -> {value: code}
+        self.watermark = None  # newest jobs_job.updated_at applied
+        self.tag = ''          # caller-defined version of the metadata (e.g. skill taxonomy)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, job_id):
+        return job_id in self._positions
+
+    @property
+    def ids(self):
+        return self._ids[:self._size]
+
+    @property
+    def matrix(self):
+        return self._matrix[:self._size]
+
+    @property
+    def skill_words(self):
+        return self._skills.shape[1]
+
+    def metadata(self, row):
+        return self._metadata[row]
+
+    def skills(self, row):
+        """Skill bitset of one row"""
+        return self._skills[row]
+
+    def other_skills(self, row):
+        """Skills of one row that have no bit, by name"""
+        return self._metadata[row].get('other_skills', frozenset())
+
+    # ---------------- Mutation ----------------
+    def clear(self):
+        with self.lock:
+            self._size = 0
+            self._positions = {}
+            self._metadata = []
+            self.watermark = None
+
+    def upsert(self, job_id, vector, skills=None, facets=None, **metadata):
+        """Add a job or replace its vector, skill bitset, facets and metadata in place"""
+        vector = self._normalize(vector)
+        return self.upsert_many([job_id], vector[None, :], [skills], [facets], [metadata])[0]
+
+    def upsert_many(self, job_ids, vectors, skills=None, facets=None, metadata=None):
+        """Bulk ``upsert`` from an ``(n, dim)`` matrix, e.g. a whole catalog on rebuild.
+
+        Vectors are normalized and written in one vectorized step; ``skills``,
+        ``facets`` and ``metadata`` are optional per-job lists. A job's
+        ``other_skills`` metadata (a frozenset) holds skills with no bit.
+        Returns the rows.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape != (len(job_ids), self.dim):
+            raise ValueError(f"Expected a ({len(job_ids)}, {self.dim}) matrix, got {vectors.shape}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+        skills = [np.zeros(0, dtype=np.uint64) if words is None else np.asarray(words, dtype=np.uint64)
+                  for words in (skills or [None] * len(job_ids))]
+        facets = facets or [None] * len(job_ids)
+        metadata = metadata or [{}] * len(job_ids)
+
+        with self.lock:
+            self._widen_skills(max((len(words) for words in skills), default=0))
+            self._reserve(self._size + len(job_ids))
+            rows = np.empty(len(job_ids), dtype=np.intp)
+            for i, job_id in enumerate(job_ids):
+                row = self._positions.get(job_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._positions[job_id] = row
+                    self._ids[row] = job_id
+                    self._metadata.append(metadata[i])
+                else:
+                    self._metadata[row] = metadata[i]
+                rows[i] = row
+                self._skills[row] = 0
+                self._skills[row, :len(skills[i])] = skills[i]
+                for column in self._facets.values():
+                    column[row] = -1
+                for name, value in (facets[i] or {}).items():
+                    column = self._facet_column(name)
+                    column[row] = self._facet_code(name, value)
+            self._matrix[rows] = vectors
+            self._skill_counts[rows] = np.bitwise_count(self._skills[rows]).sum(axis=1) + [
+                len(item.get('other_skills', ())) for item in metadata]
+            return rows
+
+    def remove(self, job_id):
+        """Drop a job by moving the last row into its slot"""
+        with self.lock:
+            row = self._positions.pop(job_id, None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._skills[row] = self._skills[last]
+                self._skill_counts[row] = self._skill_counts[last]
+                for column in self._facets.values():
+                    column[row] = column[last]
+                self._metadata[row] = self._metadata[last]
+                self._positions[moved_id] = row
+            self._metadata.pop()
+            self._size = last
+            return True
+
+    def adopt(self, other):
+        """Take over every row and setting of ``other``, e.g. an index rebuilt in the background"""
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot adopt a {type(other).__name__} into a {type(self).__name__}")
+        state = dict(vars(other))
+        state.pop('lock')
+        with self.lock:
+            vars(self).update(state)
+
+    # ---------------- Query ----------------
+    def similarities(self, query):
+        """Cosine similarity of ``query`` against every indexed job"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if query.size != self.dim:
+            return np.zeros(self._size, dtype=np.float32)
+        return self.matrix @ self._normalize(query)
+
+    def candidates(self, query, n=None, filters=None):
+        """Rows worth scoring for ``query`` that pass ``filters``, and their similarities.
+
+        ``filters`` are facet filters as in ``filter_mask``. The exact index
+        scores every row; ``n`` is accepted for interface parity with
+        approximate backends and ignored.
+        """
+        return self._filter(np.arange(self._size), self.similarities(query), filters)
+
+    def skill_overlap(self, rows, query_skills, query_other=frozenset()):
+        """Per row: how many of its skills the query has, and how many it has.
+
+        ``query_skills`` is a bitset; ``query_other`` holds the query's
+        skills without a bit, matched by name against ``other_skills``.
+        """
+        query = np.zeros(self.skill_words, dtype=np.uint64)
+        width = min(len(query_skills), self.skill_words)
+        query[:width] = query_skills[:width]
+        matched = np.bitwise_count(self._skills[rows] & query).sum(axis=1, dtype=np.int32)
+        if query_other:
+            # Named skills are rare: only rows that have any are compared
+            for i in np.flatnonzero(self._skill_counts[rows] > np.bitwise_count(self._skills[rows]).sum(axis=1)):
+                matched[i] += len(self.other_skills(rows[i]) & query_other)
+        return matched, self._skill_counts[rows]
+
+    def filter_mask(self, rows, **filters):
+        """Boolean mask over ``rows`` of the jobs that pass every facet filter.
+
+        A filter is either a collection of allowed values or a predicate
+        called once per distinct value of the facet.
+        """
+        mask = np.ones(len(rows), dtype=bool)
+        for name, allowed in filters.items():
+            values = self._facet_values.get(name, [])
+            if callable(allowed):
+                codes = [code for code, value in enumerate(values) if allowed(value)]
+            else:
+                known = self._facet_codes.get(name, {})
+                codes = [known[value] for value in allowed if value in known]
+            column = self._facets.get(name)
+            if column is None:
+                mask[:] = False
+            else:
+                mask &= np.isin(column[rows], codes)
+        return mask
+
+    def _filter(self, rows, similarities, filters):
+        if not filters:
+            return rows, similarities
+        keep = self.filter_mask(rows, **filters)
+        return rows[keep], similarities[keep]
+
+    def search(self, query, k=10):
+        """Return ``[(job_id, score), ...]`` for the k most similar jobs"""
+        with self.lock:
+            rows, scores = self.candidates(query, k)
+            best = self.top_k(scores, k)
+            return [(int(self._ids[rows[i]]), float(scores[i])) for i in best]
+
+    @staticmethod
+    def top_k(scores, k):
+        """Row indices of the k highest scores, best first"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < len(scores):
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(len(scores))
+        return rows[np.argsort(-scores[rows], kind='stable')]
+
+    # ---------------- Persistence ----------------
+    def save(self, directory):
+        """Write a snapshot generation under ``directory`` and make it the current one.
+
+        Every array is a plain ``.npy`` file so ``load`` can memory-map it;
+        ``header.json`` records the format, dimension, size, tag and
+        watermark. The live rows are copied under the lock and written
+        outside it, so queries are only blocked for the copy. Older
+        generations are pruned, keeping the previous one for processes
+        that still have it mapped.
+        """
+        with self.lock:
+            size = self._size
+            matrix = self.matrix.copy()
+            ids = self.ids.copy()
+            skills = self._skills[:size].copy()
+            facets = {name: column[:size].copy() for name, column in self._facets.items()}
+            extra = {name: np.array(array, copy=True) for name, array in self._extra_state().items()}
+            metadata = list(self._metadata)
+            header = {
+                'format': SNAPSHOT_FORMAT,
+                'dim': self.dim,
+                'size': size,
+                'watermark': self.watermark.isoformat() if self.watermark else None,
+                'tag': self.tag,
+                'skill_vocabulary': list(self.skill_vocabulary),
+                'facets': {name: list(values) for name, values in self._facet_values.items()},
+                'extra': list(extra),
+            }
+
+        generation = f"{time.time_ns():016x}-{os.getpid()}"
+        path = os.path.join(directory, generation)
+        os.makedirs(path)
+
+        capacity = size + max(SNAPSHOT_MIN_HEADROOM, size // 8)
+        mapped = np.lib.format.open_memmap(os.path.join(path, 'matrix.npy'), mode='w+',
+                                           dtype=np.float32, shape=(capacity, self.dim))
+        mapped[:size] = matrix
+        mapped.flush()
+        del mapped
+        np.save(os.path.join(path, 'ids.npy'), ids)
+        np.save(os.path.join(path, 'skills.npy'), skills)
+        for name, column in facets.items():
+            np.save(os.path.join(path, f'facet_{name}.npy'), column)
+        for name, array in extra.items():
+            np.save(os.path.join(path, f'extra_{name}.npy'), array)
+        with open(os.path.join(path, 'metadata.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, default=sorted)
+
+        # Written last: a generation without a header is incomplete
+        with open(os.path.join(path, 'header.json'), 'w', encoding='utf-8') as f:
+            json.dump(header, f)
+        tmp_path = os.path.join(directory, f'CURRENT.tmp.{os.getpid()}')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(generation)
+        os.replace(tmp_path, os.path.join(directory, 'CURRENT'))
+
+        for stale in sorted(name for name in os.listdir(directory) if '-' in name)[:-2]:
+            shutil.rmtree(os.path.join(directory, stale), ignore_errors=True)
+
+    def load(self, directory):
+        """Replace the index contents with the current snapshot under ``directory``.
+
+        The vector matrix is memory-mapped copy-on-write: processes loading
+        the same snapshot share its pages, and a row is only copied into
+        private memory when it is written.
+        """
+        path = os.path.join(directory, self._current_generation(directory))
+        with open(os.path.join(path, 'header.json'), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header['format'] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Snapshot at {path} has format {header['format']}, expected {SNAPSHOT_FORMAT}")
+        if header['dim'] != self.dim:
+            raise ValueError(f"Snapshot at {path} has dimension {header['dim']}, expected {self.dim}")
+
+        size = header['size']
+        matrix = np.load(os.path.join(path, 'matrix.npy'), mmap_mode='c')
+        ids = np.load(os.path.join(path, 'ids.npy'))
+        skills = np.load(os.path.join(path, 'skills.npy'))
+        facets = {name: np.load(os.path.join(path, f'facet_{name}.npy')) for name in header['facets']}
+        extra = {name: np.load(os.path.join(path, f'extra_{name}.npy')) for name in header['extra']}
+        with open(os.path.join(path, 'metadata.json'), 'r', encoding='utf-8') as f:
+            # Sets are stored as JSON lists and come back as frozensets
+            metadata = [{key: frozenset(value) if isinstance(value, list) else value
+                         for key, value in item.items()}
+                        for item in json.load(f)]
+
+        with self.lock:
+            self._size = 0
+            self._matrix = matrix
+            self._facets, self._facet_values, self._facet_codes = {}, {}, {}
+            self._resize_columns(len(matrix))
+            self._widen_skills(skills.shape[1])
+            self._size = size
+            self._ids[:size] = ids
+            self._positions = {int(job_id): row for row, job_id in enumerate(ids)}
+            self._metadata = metadata
+            self._skills[:size, :skills.shape[1]] = skills
+            self._skill_counts[:size] = np.bitwise_count(skills).sum(axis=1) + [
+                len(item.get('other_skills', ())) for item in metadata]
+            self.skill_vocabulary = header['skill_vocabulary']
+            for name, values in header['facets'].items():
+                column = self._facet_column(name)
+                column[:size] = facets[name]
+                for value in values:
+                    self._facet_code(name, value)
+            self.watermark = datetime.fromisoformat(header['watermark']) if header['watermark'] else None
+            self.tag = header['tag']
+            self._load_extra_state(extra)
+
+    @classmethod
+    def snapshot_header(cls, directory):
+        """Header of the current snapshot under ``directory``, or None if there is none"""
+        try:
+            path = os.path.join(directory, cls._current_generation(directory), 'header.json')
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _current_generation(directory):
+        with open(os.path.join(directory, 'CURRENT'), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+
+    def _extra_state(self):
+        return {}
+
+    def _load_extra_state(self, state):
+        pass
+
+    # ---------------- Helpers ----------------
+    def _normalize(self, vector):
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        if vector.size != self.dim:
+            raise ValueError(f"Expected a {self.dim}-d vector, got {vector.size}")
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _reserve(self, capacity):
+        if capacity <= len(self._matrix):
+            return
+        new_capacity = max(capacity, 2 * len(self._matrix))
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        self._resize_columns(new_capacity)
+
+    def _resize_columns(self, capacity):
+        """Reallocate the per-row columns to ``capacity`` rows, keeping the live ones"""
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        skills = np.zeros((capacity, self.skill_words), dtype=np.uint64)
+        skills[:self._size] = self._skills[:self._size]
+        skill_counts = np.zeros(capacity, dtype=np.int32)
+        skill_counts[:self._size] = self._skill_counts[:self._size]
+        self._ids, self._skills, self._skill_counts = ids, skills, skill_counts
+        for name, column in self._facets.items():
+            grown = np.full(capacity, -1, dtype=np.int32)
+            grown[:self._size] = column[:self._size]
+            self._facets[name] = grown
+
+    def _facet_column(self, name):
+        column = self._facets.get(name)
+        if column is None:
+            column = self._facets[name] = np.full(len(self._matrix), -1, dtype=np.int32)
+            self._facet_values.setdefault(name, [])
+            self._facet_codes.setdefault(name, {})
+        return column
+
+    def _facet_code(self, name, value):
+        codes = self._facet_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._facet_values[name])
+            self._facet_values[name].append(value)
+        return code
+
+    def _widen_skills(self, words):
+        if words <= self.skill_words:
+            return
+        skills = np.zeros((len(self._skills), words), dtype=np.uint64)
+        skills[:, :self.skill_words] = self._skills
+        self._skills = skills
@@ -1,100 +1,563 @@
-import json
+import os
+import fcntl
+import hashlib
+import time
+from collections import namedtuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from models.database import get_db_connection
+from decouple import config
+from datetime import datetime, timedelta, timezone
+from psycopg2.extras import execute_values
+from models.database import db_connection
+from services.job_index import JobIndex
+from services.ivf_index import IVFJobIndex
+from services.resume_index import ResumeIndex
+from services.embedding_service import get_embedding_service
+from services.skill_taxonomy import get_skill_taxonomy
+from services.vector_codec import encode_vector, decode_vector, decode_vectors
+
+# Job index backend: 'exact' (brute force) or 'ivf' (approximate, for very large catalogs)
+JOB_INDEX_BACKEND = config('JOB_INDEX_BACKEND', default='exact')
+ANN_NLIST = config('ANN_NLIST', default=0, cast=int)
+ANN_NPROBE = config('ANN_NPROBE', default=8, cast=int)
+ANN_MIN_SIZE = config('ANN_MIN_SIZE', default=20000, cast=int)
+ANN_CANDIDATES = config('ANN_CANDIDATES', default=500, cast=int)
+# Memory-mapped index snapshots (one subdirectory per index), shared by all workers
+INDEX_SNAPSHOT_DIR = config('INDEX_SNAPSHOT_DIR', default='indexes')
+# Jobs passed from vector retrieval to the skill-aware re-ranking stage
+RERANK_SIZE = config('RERANK_SIZE', default=200, cast=int)
+# Bump when the per-job data kept in the index changes, so persisted indexes get rebuilt
+INDEX_FORMAT = 3
+# Incremental re-matching after job changes: minimum score and maximum number of new matches
+REMATCH_THRESHOLD = config('REMATCH_THRESHOLD', default=60.0, cast=float)
+REMATCH_LIMIT = config('REMATCH_LIMIT', default=500, cast=int)
+# Seconds of already-synced changes re-read on every incremental sync. updated_at = NOW() is the
+# transaction start time, so a row can commit after a sync with a timestamp below its watermark;
+# re-reading the window picks it up (upserts are idempotent). Keep above the longest write transaction.
+INDEX_SYNC_OVERLAP = config('INDEX_SYNC_OVERLAP', default=120, cast=int)
+# Days deletions stay in the tombstone tables; a snapshot older than that may have missed some and is reloaded
+INDEX_TOMBSTONE_RETENTION_DAYS = config('INDEX_TOMBSTONE_RETENTION_DAYS', default=7, cast=int)
+
+# Where an index's rows come from: the columns handed to its indexer method, the condition for a
+# row to be indexed, and the tombstone table (with its id column) that records deleted rows
+IndexSource = namedtuple('IndexSource', 'table columns live tombstones tombstone_key indexer')
+JOB_SOURCE = IndexSource(
+    'jobs_job', 'id, title, skills_required, experience_level, job_type, location, embedding',
+    'is_active AND embedding IS NOT NULL', 'jobs_deletedjob', 'job_id', '_index_jobs',
+)
+RESUME_SOURCE = IndexSource(
+    'resumes_resume', 'id, user_id, extracted_skills, embedding',
+    'is_parsed AND embedding IS NOT NULL', 'resumes_deletedresume', 'resume_id', '_index_resumes',
+)
+
+def job_text(title, description, skills_required, requirements):
+    """Combine job fields into the text that gets embedded"""
+    return f"{title} {description or ''} {skills_required or ''} {requirements or ''}"
+
+def content_hash(text):
+    """SHA-256 of the embedded text, used to detect job edits"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def load_vector(value, dim=384):
+    """Decode a stored embedding, falling back to zeros if it is missing or corrupted"""
+    vector = decode_vector(value, dim)
+    return np.zeros(dim, dtype=np.float32) if vector is None else vector
+
+def sync_since(watermark, overlap=INDEX_SYNC_OVERLAP):
+    """Lower bound of ``updated_at`` for an incremental sync from ``watermark``"""
+    floor, window = datetime.min.replace(tzinfo=timezone.utc), timedelta(seconds=overlap)
+    return watermark - window if watermark - floor > window else floor
+
+def pad_words(words, width):
+    """Zero-extend (or cut) a skill bitset to ``width`` uint64 words"""
+    padded = np.zeros(width, dtype=np.uint64)
+    size = min(len(words), width)
+    padded[:size] = words[:size]
+    return padded
+
+class StageClock:
+    """Records milliseconds spent per pipeline stage into a dict"""
+
+    def __init__(self, timings):
+        self.timings = timings
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._last) * 1000, 3)
+        self._last = now
 
 class JobMatcher:
-    def __init__(self):
-        # Load embedding model once
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, embedder=None):
+        # Shared embedding model (see services.embedding_service)
+        self.embedder = embedder or get_embedding_service()
+        # Identifies the model and chunking that produced stored vectors (jobs_job.embedding_model)
+        self.model_name = self.embedder.fingerprint
+        self.skills = get_skill_taxonomy()
+        self.index = self._restore_index(self._build_index(self.embedder.dimension), 'jobs')
+        self.resume_index = self._restore_index(ResumeIndex(dim=self.embedder.dimension), 'resumes')
+        self._size_mismatches = {}  # index name -> consecutive maintenance runs that saw a wrong size
 
-    def find_matches(self, resume_id: int, top_k: int = 10):
-        """Find top matching jobs for a resume"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def embed_jobs(self, job_ids=None, force=False, missing_only=False):
+        """Compute and store embeddings for jobs whose content or model changed"""
+        with db_connection() as conn, conn.cursor() as cursor:
+            return self._embed_jobs(cursor, job_ids=job_ids, force=force, missing_only=missing_only)
+
+    def _embed_jobs(self, cursor, job_ids=None, force=False, missing_only=False):
+        query = """
+            SELECT id, title, description, skills_required, requirements,
+                   embedding_hash, embedding_model
+            FROM jobs_job
+        """
+        conditions, params = [], []
+        if job_ids is not None:
+            conditions.append("id = ANY(%s)")
+            params.append(list(job_ids))
+        if missing_only:
+            conditions.append("(embedding IS NULL OR embedding_model <> %s)")
+            params.append(self.model_name)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor.execute(query, params)
+
+        stale = []
+        rows = cursor.fetchall()
+        for job_id, title, description, skills_required, requirements, stored_hash, stored_model in rows:
+            text = job_text(title, description, skills_required, requirements)
+            text_hash = content_hash(text)
+            if force or text_hash != stored_hash or stored_model != self.model_name:
+                stale.append((job_id, text, text_hash))
+
+        if stale:
+            # One batched encode call for every changed job
+            embeddings = self.embedder.encode_documents([text for _, text, _ in stale])
+            execute_values(cursor, """
+                UPDATE jobs_job AS j
+                SET embedding = v.embedding::bytea,
+                    embedding_model = v.model,
+                    embedding_dim = v.dim,
+                    embedding_hash = v.hash,
+                    updated_at = NOW()
+                FROM (VALUES %s) AS v (id, embedding, model, dim, hash)
+                WHERE j.id = v.id
+            """, [
+                (job_id, encode_vector(embedding), self.model_name, len(embedding), text_hash)
+                for (job_id, _, text_hash), embedding in zip(stale, embeddings)
+            ])
+            # New vectors change rankings: invalidate match results cached by the backend
+            cursor.execute("UPDATE jobs_catalogversion SET version = version + 1 WHERE id = 1")
+
+        return {'embedded': len(stale), 'skipped': len(rows) - len(stale)}
+
+    def find_matches(self, resume_id: int, top_k: int = 10, filters=None, timings=None):
+        """Find top matching jobs for a resume.
+
+        ``filters`` may hold ``experience_level`` / ``job_type`` (lists of
+        allowed values) and ``location`` (case-insensitive substring). If a
+        ``timings`` dict is given, per-stage durations in ms are written to it.
+        """
+        with db_connection() as conn, conn.cursor() as cursor:
+            return self._find_matches(conn, cursor, resume_id, top_k, filters or {},
+                                      timings if timings is not None else {})
+
+    def _find_matches(self, conn, cursor, resume_id, top_k, filters, timings):
+        clock = StageClock(timings)
 
         # ---------------- Get resume data ----------------
         cursor.execute("""
-            SELECT embedding_vector, extracted_skills, user_id 
+            SELECT embedding, extracted_skills, user_id
             FROM resumes_resume 
             WHERE id = %s AND is_parsed = TRUE
         """, (resume_id,))
         resume_data = cursor.fetchone()
         if not resume_data:
-            cursor.close()
-            conn.close()
             return []
 
         # Safe embedding loading
-        try:
-            resume_embedding = np.array(json.loads(resume_data[0]))
-        except Exception:
-            # Fallback if embedding is missing or corrupted
-            resume_embedding = np.zeros((384,), dtype=float)
+        resume_embedding = load_vector(resume_data[0], dim=self.index.dim)
 
-        resume_skills = set(s.strip().lower() for s in (resume_data[1] or '').split(',') if s)
+        # Also maps resumes parsed before the taxonomy existed onto canonical ids
+        resume_skills, resume_other = self._skill_sets(resume_data[1])
         user_id = resume_data[2]
 
-        # ---------------- Get active jobs ----------------
-        cursor.execute("""
-            SELECT id, title, description, skills_required, requirements
-            FROM jobs_job
-            WHERE is_active = TRUE
-        """)
-        jobs = cursor.fetchall()
-        matches = []
+        # Only recent changes are applied here; backfills, rebuilds and training run in maintain_indexes
+        with self.index.lock:
+            self._sync_rows(cursor, self.index, JOB_SOURCE)
+            clock.lap('sync')
 
-        for job in jobs:
-            job_id, title, description, skills_required, requirements = job
+            resume_words = pad_words(resume_skills, self.index.skill_words)
 
-            # Combine job fields into text
-            job_text = f"{title} {description or ''} {skills_required or ''} {requirements or ''}"
-            job_embedding = self.embedding_model.encode(job_text)
-
-            # Compute cosine similarity safely
-            try:
-                similarity = cosine_similarity(
-                    resume_embedding.reshape(1, -1),
-                    job_embedding.reshape(1, -1)
-                )[0][0]
-            except Exception as e:
-                print(f"[Warning] Similarity error for job {job_id}: {e}")
-                similarity = 0.0
-
-            # Skill matching
-            job_skills = set(s.strip().lower() for s in (skills_required or '').split(',') if s)
-            matching_skills = resume_skills.intersection(job_skills)
-            skill_gaps = job_skills - resume_skills
-            skill_match_score = len(matching_skills) / len(job_skills) if job_skills else 0
-
-            # Combined score: 70% embedding + 30% skills
-            final_score = (similarity * 0.7 + skill_match_score * 0.3) * 100
-
-            matches.append({
-                'job_id': job_id,
-                'title': title,
-                'match_score': float(round(final_score, 2)),  # ✅ convert to native float
-                'matching_skills': ', '.join(sorted(matching_skills)),
-                'skill_gaps': ', '.join(sorted(skill_gaps)),
-                'recommendation': self._generate_recommendation(final_score, matching_skills, skill_gaps)
-            })
-
-        # Sort by final score and take top_k
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
-        top_matches = matches[:top_k]
+            rows, similarities = self._generate_candidates(resume_embedding, filters, max(RERANK_SIZE, top_k))
+            clock.lap('candidates')
+            rows, scores = self._rerank(rows, similarities, resume_words, resume_other, top_k)
+            clock.lap('rerank')
+            top_matches = [self._format_match(row, score, resume_words, resume_other)
+                           for row, score in zip(rows, scores)]
+            clock.lap('format')
 
         # Save matches to database safely
         try:
             self._save_matches(cursor, conn, resume_id, user_id, top_matches)
         except Exception as e:
+            conn.rollback()
             print(f"[Error] Saving matches to DB failed: {e}")
+        clock.lap('save')
 
-        cursor.close()
-        conn.close()
         return top_matches
 
+    # ---------------- Matching stages ----------------
+    def _generate_candidates(self, resume_embedding, filters, size):
+        """Stage 1: vector retrieval under hard filters, keeps the ``size`` most similar jobs"""
+        facet_filters = {name: values for name, values in filters.items()
+                         if name in ('experience_level', 'job_type') and values}
+        if filters.get('location'):
+            needle = filters['location'].strip().lower()
+            facet_filters['location'] = lambda location: needle in location
+        # Filtered before the approximate backend keeps its best ANN_CANDIDATES, so filters never starve it
+        rows, similarities = self.index.candidates(resume_embedding, max(ANN_CANDIDATES, size), facet_filters)
+
+        best = JobIndex.top_k(similarities, size)
+        return rows[best], similarities[best]
+
+    def _rerank(self, rows, similarities, resume_words, resume_other, top_k):
+        """Stage 2: blend embedding and skill scores, returns the top_k rows and scores"""
+        # Share of each job's skills the resume covers, for all candidates at once
+        matched, required = self.index.skill_overlap(rows, resume_words, resume_other)
+        skill_scores = np.divide(matched, required, out=np.zeros(len(rows), dtype=np.float32),
+                                 where=required > 0)
+
+        # Combined score: 70% embedding + 30% skills
+        final_scores = (similarities * 0.7 + skill_scores * 0.3) * 100
+
+        best = JobIndex.top_k(final_scores, top_k)
+        return rows[best], final_scores[best]
+
+    def _format_match(self, row, score, resume_words, resume_other):
+        """Stage 3: decode names and build the response for one returned job"""
+        job = self.index.metadata(row)
+        final_score = float(score)
+        job_skills, job_other = self.index.skills(row), self.index.other_skills(row)
+        matching_skills = sorted(self.skills.decode(job_skills & resume_words) + list(job_other & resume_other))
+        skill_gaps = sorted(self.skills.decode(job_skills & ~resume_words) + list(job_other - resume_other))
+        return {
+            'job_id': int(self.index.ids[row]),
+            'title': job['title'],
+            'match_score': float(round(final_score, 2)),  # ✅ convert to native float
+            'matching_skills': ', '.join(matching_skills),
+            'skill_gaps': ', '.join(skill_gaps),
+            'recommendation': self._generate_recommendation(final_score, matching_skills, skill_gaps)
+        }
+
+    # ---------------- Reverse matching ----------------
+    def find_candidates(self, job_id: int, limit: int = 20, offset: int = 0, timings=None):
+        """Rank every parsed resume against one job.
+
+        Returns ``(total, page)``, where ``page`` holds the ``limit`` best
+        candidates after the first ``offset``, or None if the job does not exist.
+        """
+        with db_connection() as conn, conn.cursor() as cursor:
+            return self._find_candidates(cursor, job_id, limit, offset, timings if timings is not None else {})
+
+    def _find_candidates(self, cursor, job_id, limit, offset, timings):
+        clock = StageClock(timings)
+
+        self._embed_jobs(cursor, job_ids=[job_id], missing_only=True)
+        cursor.execute("SELECT embedding, skills_required FROM jobs_job WHERE id = %s", (job_id,))
+        job = cursor.fetchone()
+        if not job:
+            return None
+
+        with self.resume_index.lock:
+            self._sync_rows(cursor, self.resume_index, RESUME_SOURCE)
+            clock.lap('sync')
+            rows, scores, job_skills = self._score_resumes(*job)
+            clock.lap('rank')
+            page = [self._format_candidate(rows[i], scores[i], job_skills)
+                    for i in JobIndex.top_k(scores, offset + limit)[offset:]]
+            clock.lap('format')
+
+        return len(rows), page
+
+    def rematch_job(self, job_id: int, threshold: float = REMATCH_THRESHOLD, limit: int = REMATCH_LIMIT):
+        """Refresh stored matches after a job was created, edited or deactivated.
+
+        Active jobs are scored against the resume index; matches are upserted
+        for the ``limit`` best resumes scoring at least ``threshold`` and for
+        every resume that already had a match with the job. Matches of
+        inactive or deleted jobs that are still pending are pruned.
+        """
+        with db_connection() as conn, conn.cursor() as cursor:
+            return self._rematch_job(cursor, job_id, threshold, limit)
+
+    def _rematch_job(self, cursor, job_id, threshold, limit):
+        # No-op when the stored embedding already matches the job's content
+        self._embed_jobs(cursor, job_ids=[job_id])
+        cursor.execute("SELECT is_active, embedding, skills_required FROM jobs_job WHERE id = %s", (job_id,))
+        job = cursor.fetchone()
+        if job is None or not job[0]:
+            # Shortlisted/interviewed matches carry recruiter decisions and are kept
+            cursor.execute("DELETE FROM matches_match WHERE job_id = %s AND status = 'pending'", (job_id,))
+            return {'updated': 0, 'pruned': cursor.rowcount}
+
+        cursor.execute("SELECT resume_id FROM matches_match WHERE job_id = %s", (job_id,))
+        matched_resumes = [row[0] for row in cursor.fetchall()]
+
+        with self.resume_index.lock:
+            self._sync_rows(cursor, self.resume_index, RESUME_SOURCE)
+            rows, scores, job_skills = self._score_resumes(job[1], job[2])
+
+            above = np.flatnonzero(scores >= threshold)
+            selected = np.union1d(
+                above[JobIndex.top_k(scores[above], limit)],
+                np.flatnonzero(np.isin(self.resume_index.ids[rows], matched_resumes)),
+            )
+            matches = []
+            for i in selected:
+                row, score = rows[i], float(scores[i])
+                matching_skills, skill_gaps = self._resume_skill_names(row, job_skills)
+                matches.append((self.resume_index.metadata(row)['user_id'], int(self.resume_index.ids[row]), {
+                    'job_id': job_id,
+                    'match_score': round(score, 2),
+                    'matching_skills': ', '.join(matching_skills),
+                    'skill_gaps': ', '.join(skill_gaps),
+                    'recommendation': self._generate_recommendation(score, matching_skills, skill_gaps),
+                }))
+
+        return {'updated': len(save_matches(cursor, matches)), 'pruned': 0}
+
+    def _score_resumes(self, job_embedding, skills_required):
+        """Blend score of every indexed resume for one job: one matrix-vector product and one bitset AND.
+
+        Returns the resume index rows, their scores and the job's skills: a
+        bitset padded to cover both the job and the index, and the skills
+        without a bit.
+        """
+        job_skills, job_other = self._skill_sets(skills_required)
+        required = int(np.bitwise_count(job_skills).sum()) + len(job_other)
+        job_words = pad_words(job_skills, max(len(job_skills), self.resume_index.skill_words))
+
+        rows, similarities = self.resume_index.candidates(load_vector(job_embedding, dim=self.resume_index.dim))
+        matched, _ = self.resume_index.skill_overlap(rows, job_words, job_other)
+        skill_scores = np.divide(matched, required, out=np.zeros(len(rows), dtype=np.float32),
+                                 where=required > 0)
+        return rows, (similarities * 0.7 + skill_scores * 0.3) * 100, (job_words, job_other)
+
+    def _format_candidate(self, row, score, job_skills):
+        matching_skills, skill_gaps = self._resume_skill_names(row, job_skills)
+        return {
+            'resume_id': int(self.resume_index.ids[row]),
+            'candidate_id': self.resume_index.metadata(row)['user_id'],
+            'match_score': float(round(float(score), 2)),
+            'matching_skills': ', '.join(matching_skills),
+            'skill_gaps': ', '.join(skill_gaps),
+        }
+
+    def _resume_skill_names(self, row, job_skills):
+        """Job skills the resume at ``row`` has, and the ones it lacks"""
+        job_words, job_other = job_skills
+        resume_words = pad_words(self.resume_index.skills(row), len(job_words))
+        resume_other = self.resume_index.other_skills(row)
+        return (sorted(self.skills.decode(job_words & resume_words) + list(job_other & resume_other)),
+                sorted(self.skills.decode(job_words & ~resume_words) + list(job_other - resume_other)))
+
+    def _index_resumes(self, index, rows):
+        """Upsert ``(id, user_id, extracted_skills, embedding)`` rows, decoding all vectors at once"""
+        vectors, valid = decode_vectors([row[3] for row in rows], index.dim)
+        for row in (row for row, ok in zip(rows, valid) if not ok):
+            index.remove(row[0])
+        rows = [row for row, ok in zip(rows, valid) if ok]
+        skills, metadata = [], []
+        for row in rows:
+            words, other = self._skill_sets(row[2])
+            skills.append(words)
+            metadata.append({'user_id': row[1], 'other_skills': other} if other else {'user_id': row[1]})
+        index.upsert_many([row[0] for row in rows], vectors, skills=skills, metadata=metadata)
+
     # ---------------- Helper methods ----------------
+    def _build_index(self, dim):
+        if JOB_INDEX_BACKEND != 'ivf':
+            return JobIndex(dim=dim)
+        return IVFJobIndex(dim=dim, nlist=ANN_NLIST, nprobe=ANN_NPROBE, min_size=ANN_MIN_SIZE)
+
+    def _restore_index(self, index, name):
+        """Start from the latest snapshot, so only rows changed after its watermark are replayed"""
+        directory = os.path.join(INDEX_SNAPSHOT_DIR, name)
+        if index.snapshot_header(directory) is not None:
+            try:
+                index.load(directory)
+            except Exception as e:
+                print(f"[Warning] Could not load {name} index snapshot from {directory}: {e}")
+                index.clear()
+            if index.tag != self._index_tag() or not self.skills.adopt_vocabulary(index.skill_vocabulary):
+                # Built by another index format or taxonomy: reload every row on first sync
+                index.watermark = None
+            elif index.watermark and index.watermark < self._tombstone_horizon():
+                # Deletions since then may already be pruned from the tombstone tables
+                index.watermark = None
+        index.tag = self._index_tag()
+        return index
+
+    def snapshot_indexes(self):
+        """Write a snapshot of each index that advanced past its last one; returns the names written.
+
+        Meant to run periodically. Only one process writes at a time; the
+        others skip, since any up-to-date snapshot serves every worker.
+        """
+        os.makedirs(INDEX_SNAPSHOT_DIR, exist_ok=True)
+        with open(os.path.join(INDEX_SNAPSHOT_DIR, '.lock'), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return []
+            return [name for name, index in (('jobs', self.index), ('resumes', self.resume_index))
+                    if self._snapshot_index(index, name)]
+
+    def _snapshot_index(self, index, name):
+        directory = os.path.join(INDEX_SNAPSHOT_DIR, name)
+        header = index.snapshot_header(directory)
+        with index.lock:
+            if index.watermark is None:
+                return False
+            if (header and header['tag'] == index.tag and header['watermark'] and
+                    datetime.fromisoformat(header['watermark']) >= index.watermark and header['size'] == len(index)):
+                return False
+            index.skill_vocabulary = self.skills.vocabulary()
+        os.makedirs(directory, exist_ok=True)
+        # Holds the index lock only while copying the live rows, not during the file writes
+        index.save(directory)
+        return True
+
+    def _skill_sets(self, skills):
+        """Bitset of a comma-separated skill list, and its skills outside the taxonomy by name"""
+        return self.skills.split(self.skills.canonicalize(skills))
+
+    def _index_tag(self):
+        return f"{INDEX_FORMAT}:{self.skills.fingerprint}"
+
+    def _tombstone_horizon(self):
+        return datetime.now(timezone.utc) - timedelta(days=INDEX_TOMBSTONE_RETENTION_DAYS)
+
+    def _sync_rows(self, cursor, index, source):
+        """Bring ``index`` up to date with its ``source`` table; call with the index lock held.
+
+        Without a watermark every live row is loaded. Otherwise only rows
+        updated, and tombstones written, since the watermark are read,
+        re-reading the overlap window (see INDEX_SYNC_OVERLAP).
+        """
+        index_rows = getattr(self, source.indexer)
+        if index.watermark is None:
+            index.clear()
+            cursor.execute(f"SELECT {source.columns}, updated_at FROM {source.table} WHERE {source.live}")
+            rows = cursor.fetchall()
+            index_rows(index, [row[:-1] for row in rows])
+            index.watermark = max((row[-1] for row in rows), default=datetime.min.replace(tzinfo=timezone.utc))
+            return
+
+        since = sync_since(index.watermark)
+        cursor.execute(f"""
+            SELECT {source.columns}, {source.live}, updated_at
+            FROM {source.table}
+            WHERE updated_at >= %s
+        """, (since,))
+        changed = cursor.fetchall()
+        cursor.execute(f"""
+            SELECT {source.tombstone_key}, deleted_at
+            FROM {source.tombstones}
+            WHERE deleted_at >= %s
+        """, (since,))
+        deleted = cursor.fetchall()
+
+        index_rows(index, [row[:-2] for row in changed if row[-2]])
+        for row_id in [row[0] for row in changed if not row[-2]] + [row[0] for row in deleted]:
+            index.remove(row_id)
+        index.watermark = max([index.watermark, *(row[-1] for row in changed), *(row[1] for row in deleted)])
+
+    def maintain_indexes(self):
+        """Background upkeep, so match requests only ever apply recent changes.
+
+        Embeds jobs without a current embedding (e.g. created outside the
+        API), syncs the indexes, trains the approximate job index as the
+        catalog grows and prunes old tombstones. An index whose size
+        disagrees with its table on two runs in a row (rows deleted without
+        a tombstone) is rebuilt beside the live one and swapped in. Returns
+        a summary of what was done.
+        """
+        report = {'embedded': 0, 'trained': False, 'rebuilt': []}
+        with db_connection() as conn, conn.cursor() as cursor:
+            report['embedded'] = self._embed_jobs(cursor, missing_only=True)['embedded']
+            conn.commit()
+
+            indexes = (('jobs', self.index, JOB_SOURCE), ('resumes', self.resume_index, RESUME_SOURCE))
+            for name, index, source in indexes:
+                with index.lock:
+                    self._sync_rows(cursor, index, source)
+                    size = len(index)
+                cursor.execute(f"SELECT COUNT(*) FROM {source.table} WHERE {source.live}")
+                # A single mismatch can be a write that landed between the sync and the count
+                mismatched = cursor.fetchone()[0] != size
+                self._size_mismatches[name] = self._size_mismatches.get(name, 0) + 1 if mismatched else 0
+                if self._size_mismatches[name] >= 2:
+                    self._rebuild_index(cursor, index, source)
+                    self._size_mismatches[name] = 0
+                    report['rebuilt'].append(name)
+
+            if isinstance(self.index, IVFJobIndex) and self.index.needs_training:
+                self.index.train()
+                report['trained'] = True
+
+            for source in (JOB_SOURCE, RESUME_SOURCE):
+                cursor.execute(f"DELETE FROM {source.tombstones} WHERE deleted_at < %s", (self._tombstone_horizon(),))
+            conn.commit()
+
+        if report['trained']:
+            self._snapshot_trained_index()
+        return report
+
+    def _rebuild_index(self, cursor, index, source):
+        """Reload every row into a fresh index without holding ``index``'s lock, then swap it in"""
+        fresh = type(index)(dim=index.dim) if source is RESUME_SOURCE else self._build_index(index.dim)
+        self._sync_rows(cursor, fresh, source)
+        if isinstance(fresh, IVFJobIndex) and fresh.needs_training:
+            fresh.train()
+        with index.lock:
+            # Catch up with what changed during the reload, then take its place
+            self._sync_rows(cursor, fresh, source)
+            fresh.tag, fresh.skill_vocabulary = index.tag, index.skill_vocabulary
+            index.adopt(fresh)
+
+    def _snapshot_trained_index(self):
+        """Snapshot the job index right after training so restarts skip it; call without the index lock"""
+        try:
+            self._snapshot_index(self.index, 'jobs')
+        except Exception as e:
+            print(f"[Warning] Could not snapshot job index to {INDEX_SNAPSHOT_DIR}: {e}")
+
+    def _index_jobs(self, index, rows):
+        """Upsert ``(id, title, skills_required, experience_level, job_type, location, embedding)`` rows.
+
+        All vectors are decoded in one pass; jobs whose stored vector has
+        the wrong size are dropped from the index.
+        """
+        vectors, valid = decode_vectors([row[6] for row in rows], index.dim)
+        for row in (row for row, ok in zip(rows, valid) if not ok):
+            index.remove(row[0])
+        rows = [row for row, ok in zip(rows, valid) if ok]
+        skills, metadata = [], []
+        for row in rows:
+            # Skills outside the taxonomy have no bit but still count as required
+            words, other = self._skill_sets(row[2])
+            skills.append(words)
+            metadata.append({'title': row[1], 'other_skills': other} if other else {'title': row[1]})
+        index.upsert_many(
+            [row[0] for row in rows], vectors,
+            skills=skills,
+            facets=[{
+                'experience_level': row[3],
+                'job_type': row[4],
+                'location': (row[5] or '').strip().lower(),
+            } for row in rows],
+            metadata=metadata,
+        )
+
     def _generate_recommendation(self, score, matching_skills, skill_gaps):
         """Generate AI recommendation text"""
         if score >= 80:
@@ -107,26 +570,47 @@ class JobMatcher:
 
     def _save_matches(self, cursor, conn, resume_id, user_id, matches):
         """Save matches to database with upsert"""
-        for match in matches:
-            cursor.execute("""
-                INSERT INTO matches_match 
-                (candidate_id, job_id, resume_id, match_score, matching_skills, 
-                 skill_gaps, recommendation, status, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', NOW(), NOW())
-                ON CONFLICT (candidate_id, job_id, resume_id) 
-                DO UPDATE SET 
-                    match_score = EXCLUDED.match_score,
-                    matching_skills = EXCLUDED.matching_skills,
-                    skill_gaps = EXCLUDED.skill_gaps,
-                    recommendation = EXCLUDED.recommendation,
-                    updated_at = NOW()
-            """, (
-                user_id,
-                match['job_id'],
-                resume_id,
-                float(match['match_score']),  # ✅ ensure native float
-                match['matching_skills'],
-                match['skill_gaps'],
-                match['recommendation']
-            ))
+        save_matches(cursor, [(user_id, resume_id, match) for match in matches])
         conn.commit()
+
+
+def save_matches(cursor, rows):
+    """Bulk upsert matches for one or many resumes in a single statement.
+
+    ``rows`` holds ``(candidate_id, resume_id, match)`` tuples, where
+    ``match`` is a dict as returned by ``find_matches``. Returns the ids of
+    the inserted or updated ``matches_match`` rows.
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement: last one wins
+    values = {}
+    for candidate_id, resume_id, match in rows:
+        values[(candidate_id, match['job_id'], resume_id)] = (
+            candidate_id,
+            match['job_id'],
+            resume_id,
+            float(match['match_score']),  # ✅ ensure native float
+            match['matching_skills'],
+            match['skill_gaps'],
+            match['recommendation']
+        )
+    if not values:
+        return []
+
+    result = execute_values(cursor, """
+        INSERT INTO matches_match 
+        (candidate_id, job_id, resume_id, match_score, matching_skills, 
+         skill_gaps, recommendation, status, created_at, updated_at)
+        VALUES %s
+        ON CONFLICT (candidate_id, job_id, resume_id) 
+        DO UPDATE SET 
+            match_score = EXCLUDED.match_score,
+            matching_skills = EXCLUDED.matching_skills,
+            skill_gaps = EXCLUDED.skill_gaps,
+            recommendation = EXCLUDED.recommendation,
+            updated_at = NOW()
+        RETURNING id
+    """, list(values.values()),
+        template="(%s, %s, %s, %s, %s, %s, %s, 'pending', NOW(), NOW())",
+        page_size=len(values),
+        fetch=True)
+    return [row[0] for row in result]
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import threading
+from decouple import config
+
+PARSE_CACHE_DIR = config('PARSE_CACHE_DIR', default='cache/parses')
+PARSE_CACHE_MAX_ENTRIES = config('PARSE_CACHE_MAX_ENTRIES', default=20000, cast=int)
+
+class ParseCache:
+    """Content-addressed, on-disk cache of parse results.
+
+    Entries live under ``<directory>/<version>/<hash[:2]>/<hash>.json`` where
+    ``version`` fingerprints the parser code, models and skill taxonomy, so
+    changing any of them simply stops old entries from being found. Reads
+    refresh an entry's mtime; once ``max_entries`` is exceeded the least
+    recently used tenth is deleted.
+    """
+
+    def __init__(self, version, directory=PARSE_CACHE_DIR, max_entries=PARSE_CACHE_MAX_ENTRIES):
+        self.version = version
+        self.directory = directory
+        self.max_entries = max_entries
+        self._root = os.path.join(directory, version)
+        self._lock = threading.Lock()
+        self._count = None
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, content_hash):
+        path = self._path(content_hash)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)  # LRU bookkeeping
+        except (OSError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return data
+
+    def put(self, content_hash, data):
+        path = self._path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        is_new = not os.path.exists(path)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+        if is_new:
+            with self._lock:
+                if self._count is None:
+                    self._count = len(self._entries())
+                else:
+                    self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+
+    def invalidate(self, content_hash=None):
+        """Drop one entry, or every entry of the current version; returns how many were removed"""
+        with self._lock:
+            if content_hash is not None:
+                try:
+                    os.remove(self._path(content_hash))
+                except FileNotFoundError:
+                    return 0
+                if self._count:
+                    self._count -= 1
+                return 1
+            removed = len(self._entries())
+            shutil.rmtree(self._root, ignore_errors=True)
+            self._count = 0
+            return removed
+
+    def purge_stale_versions(self):
+        """Delete entries written by other parser/model/taxonomy versions"""
+        if not os.path.isdir(self.directory):
+            return []
+        stale = [name for name in os.listdir(self.directory) if name != self.version]
+        for name in stale:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        return stale
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'entries': self._count,
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+    # ---------------- Helpers ----------------
+    def _path(self, content_hash):
+        if not content_hash or not all(c in '0123456789abcdef' for c in content_hash):
+            raise ValueError("content_hash must be a lowercase hex digest")
+        return os.path.join(self._root, content_hash[:2], f"{content_hash}.json")
+
+    def _entries(self):
+        entries = []
+        if os.path.isdir(self._root):
+            for shard in os.scandir(self._root):
+                if shard.is_dir():
+                    entries.extend(entry for entry in os.scandir(shard.path) if entry.name.endswith('.json'))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        excess = len(entries) - self.max_entries
+        for entry in entries[:max(excess, self.max_entries // 10)]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        self._count = len(self._entries())
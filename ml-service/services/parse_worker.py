@@ -0,0 +1,45 @@
+"""Entry points for resume parsing inside a worker pool.
+
+In process mode each worker process builds its own ResumeParser in
+``init_worker``; in thread mode the parser is built on first use and
+shares the API process's embedding model (see get_embedding_service).
+"""
+import threading
+from services import pdf_text
+from services.resume_parser import ResumeParser
+
+_parser = None
+_parser_lock = threading.Lock()
+
+def init_worker():
+    global _parser
+    # Already a pool process: extract PDF pages here rather than starting a page pool per worker
+    pdf_text.disable_parallel()
+    _parser = ResumeParser()
+
+def use_parser(parser):
+    global _parser
+    _parser = parser
+
+def get_parser():
+    """The worker's ResumeParser, loaded once even if several threads ask at the same time"""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = ResumeParser()
+    return _parser
+
+def warm_up(text):
+    """Load the parser and run ``text`` through it so the first real request is not slow"""
+    get_parser()._parse_text(text)
+    return True
+
+def parse_file(file_path):
+    return get_parser().parse(file_path)
+
+def parse_files(file_paths):
+    return get_parser().parse_batch(file_paths)
+
+def parse_buffer(data, filename):
+    return get_parser().parse_buffer(data, filename)
@@ -0,0 +1,139 @@
+"""Streaming PDF text extraction with page, time and text budgets.
+
+Pages are produced lazily and joined once at the end. Long documents are
+split into page ranges extracted in a small process pool; either way the
+caller stops pulling pages as soon as enough text has been gathered.
+Files on disk reach the pool as a path each worker maps itself; only
+in-memory uploads are sent as bytes, once per worker.
+"""
+import io
+import math
+import mmap
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import PyPDF2
+from decouple import config
+
+# Pages read per document, and wall-clock seconds spent on it
+PDF_MAX_PAGES = config('PDF_MAX_PAGES', default=40, cast=int)
+PDF_TIME_BUDGET = config('PDF_TIME_BUDGET', default=15.0, cast=float)
+# Characters after which extraction stops: plenty for skill matching, far beyond the embedding window
+PDF_TEXT_BUDGET = config('PDF_TEXT_BUDGET', default=60000, cast=int)
+# Documents with at least this many pages are extracted in parallel (PDF_WORKERS=0 disables it)
+PDF_PARALLEL_MIN_PAGES = config('PDF_PARALLEL_MIN_PAGES', default=12, cast=int)
+PDF_WORKERS = config('PDF_WORKERS', default=2, cast=int)
+# Off in processes that are themselves pool workers (see disable_parallel)
+_parallel = PDF_WORKERS > 0
+
+def disable_parallel():
+    """Extract every page in this process, e.g. inside a parse worker, so pools are not nested"""
+    global _parallel
+    _parallel = False
+
+def extract_pdf_text(stream, filename='', max_pages=PDF_MAX_PAGES, time_budget=PDF_TIME_BUDGET,
+                     text_budget=PDF_TEXT_BUDGET, path=None):
+    """Text of the first pages of a PDF, one line break after each page.
+
+    Stops at ``max_pages`` pages, after ``time_budget`` seconds, or once
+    ``text_budget`` characters were collected, whichever comes first.
+    ``path`` is the file ``stream`` was read from, if any; parallel
+    extraction then hands workers the path instead of the contents.
+    """
+    deadline = time.time() + time_budget
+    reader = PyPDF2.PdfReader(stream)
+    page_count = min(len(reader.pages), max_pages)
+    if _parallel and page_count >= PDF_PARALLEL_MIN_PAGES:
+        pages = _iter_pages_parallel(reader, stream, path, page_count, deadline, filename)
+    else:
+        pages = _iter_pages(reader, 0, page_count, deadline, filename)
+
+    parts, size = [], 0
+    try:
+        for text in pages:
+            if text:
+                parts.append(text)
+                size += len(text) + 1
+                if size >= text_budget:
+                    break
+    finally:
+        pages.close()
+    return ''.join(f"{text}\n" for text in parts)
+
+def _iter_pages(reader, start, stop, deadline, filename=''):
+    """Yield page texts lazily until ``stop`` or the deadline; unreadable pages yield ''"""
+    for number in range(start, stop):
+        if time.time() >= deadline:
+            print(f"Warning: PDF time budget exhausted for {filename} after {number} pages")
+            return
+        try:
+            yield reader.pages[number].extract_text() or ''
+        except Exception as e:
+            print(f"Warning: could not extract page {number + 1} of {filename}: {e}")
+            yield ''
+
+def _iter_pages_parallel(reader, stream, path, page_count, deadline, filename):
+    """Yield page texts in order while page ranges are extracted in worker processes"""
+    if path is not None:
+        source, ranges = path, 2 * PDF_WORKERS
+    else:
+        # One range per worker: each range pickles its own copy of the document
+        source = stream[:] if isinstance(stream, mmap.mmap) else stream.getvalue()
+        ranges = PDF_WORKERS
+    chunk = math.ceil(page_count / ranges)
+    starts = range(0, page_count, chunk)
+    try:
+        futures = [_executor().submit(_extract_range, source, start, min(start + chunk, page_count), deadline)
+                   for start in starts]
+    except BrokenProcessPool:
+        _reset_executor()
+        yield from _iter_pages(reader, 0, page_count, deadline, filename)
+        return
+
+    try:
+        for start, future in zip(starts, futures):
+            try:
+                yield from future.result(timeout=max(deadline - time.time(), 0))
+            except FutureTimeout:
+                print(f"Warning: PDF time budget exhausted for {filename}")
+                return
+            except BrokenProcessPool:
+                print(f"Warning: PDF worker pool broke on {filename}, extracting pages {start + 1}+ serially")
+                _reset_executor()
+                yield from _iter_pages(reader, start, page_count, deadline, filename)
+                return
+    finally:
+        # Early stop (budget reached or caller done): drop ranges not started yet
+        for future in futures:
+            future.cancel()
+
+def _extract_range(source, start, stop, deadline):
+    """Worker side: page texts of ``[start, stop)`` from a file path or the document's bytes"""
+    if isinstance(source, str):
+        with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return list(_iter_pages(PyPDF2.PdfReader(buffer), start, stop, deadline))
+    return list(_iter_pages(PyPDF2.PdfReader(io.BytesIO(source)), start, stop, deadline))
+
+
+# ---------------- Page extraction pool ----------------
+_pool = None
+_pool_lock = threading.Lock()
+
+def _executor():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: the parser process may hold torch/spaCy threads (see services.worker_pool)
+                _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+def _reset_executor():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,8 @@
+from services.job_index import JobIndex
+
+class ResumeIndex(JobIndex):
+    """In-memory index of parsed resume embeddings, for job -> candidates search.
+
+    Same layout as ``JobIndex`` (one normalized float32 matrix plus skill
+    bitsets), keyed by resume id instead of job id.
+    """
@@ -1,105 +1,176 @@
-import PyPDF2
 import docx
-import spacy
-from sentence_transformers import SentenceTransformer
-import json
+from decouple import config
+from services.embedding_service import get_embedding_service
+from services.skill_taxonomy import get_skill_taxonomy
+from services.pdf_text import PDF_MAX_PAGES, PDF_TEXT_BUDGET, extract_pdf_text
 import re
 import os
+import io
+import mmap
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Bump whenever extraction logic changes so cached parse results are not reused
+PARSER_VERSION = 4
+SPACY_MODEL = "en_core_web_sm"
+# spaCy pipeline: 'light' (tokenizer + rule-based sentencizer, all that education extraction needs),
+# 'ner' (light plus named entities) or 'full' (every component of SPACY_MODEL)
+SPACY_MODE = config('SPACY_MODE', default='light')
+# Processes used by nlp.pipe in batch parses (forks the worker; keep 1 unless parsing large batches)
+SPACY_N_PROCESS = config('SPACY_N_PROCESS', default=1, cast=int)
+SPACY_MODE_EXCLUDES = {
+    'light': ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner', 'senter'],
+    'ner': ['tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter'],
+    'full': [],
+}
+
+def load_nlp(mode=SPACY_MODE):
+    """Load SPACY_MODEL with only the components ``mode`` needs"""
+    if mode not in SPACY_MODE_EXCLUDES:
+        raise ValueError(f"Unknown spaCy mode {mode!r}, expected one of {', '.join(SPACY_MODE_EXCLUDES)}")
+    import spacy  # imported on first load, it takes seconds
+
+    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_MODE_EXCLUDES[mode])
+    if mode != 'full':
+        # Sentence boundaries from punctuation rules instead of the dependency parser
+        nlp.add_pipe('sentencizer', first=True)
+    return nlp
+
+def parser_fingerprint(embedding_fingerprint, taxonomy=None):
+    """Short id of everything that shapes parse output: code version, models, skill taxonomy and PDF truncation"""
+    taxonomy = taxonomy or get_skill_taxonomy()
+    parts = [str(PARSER_VERSION), SPACY_MODEL, SPACY_MODE, embedding_fingerprint, taxonomy.fingerprint,
+             f"pdf:{PDF_MAX_PAGES}:{PDF_TEXT_BUDGET}"]
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
 
 class ResumeParser:
-    def __init__(self):
-        # Load NLP model
-        self.nlp = spacy.load("en_core_web_sm")
-        # Embedding model
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Skill regex patterns
-        self.skill_patterns = [
-            r'\b(python|java|javascript|react|angular|vue|django|flask|fastapi|'
-            r'sql|postgresql|mysql|mongodb|docker|kubernetes|aws|azure|gcp|'
-            r'machine learning|deep learning|nlp|computer vision|tensorflow|pytorch|'
-            r'git|agile|scrum|rest api|graphql|html|css|node\.js|typescript)\b'
-        ]
+    def __init__(self, embedder=None):
+        # Load NLP model (see SPACY_MODE)
+        self.nlp = load_nlp()
+        # Shared embedding model (see services.embedding_service)
+        self.embedder = embedder or get_embedding_service()
+        # Compiled once per process, shared with job ingestion (see services.skill_taxonomy)
+        self.skills = get_skill_taxonomy()
     
     def parse(self, file_path):
         """Main parsing function"""
         # Extract text safely
         text = self._extract_text(file_path)
-        
+        return self._parse_text(text)
+
+    def parse_buffer(self, data, filename):
+        """Parse an in-memory upload (bytes, bytearray, memoryview or mmap)"""
+        text = self._extract_text_from_buffer(data, filename)
+        return self._parse_text(text)
+
+    def _parse_text(self, text):
         if not text.strip():
             text = "Text extraction failed or empty file"
         
         # Process with spaCy
         doc = self.nlp(text)
         
-        # Extract information
-        skills = self._extract_skills(text)
-        education = self._extract_education(doc)
-        experience = self._extract_experience(text)
-        
         # Generate embedding safely
         try:
-            embedding = self.embedding_model.encode(text).tolist()
+            embedding = self.embedder.encode_document(text).tolist()
         except Exception as e:
             print(f"Warning: embedding generation failed: {e}")
             embedding = []
 
+        return self._build_result(text, doc, embedding)
+
+    def parse_batch(self, sources, max_workers=8, batch_size=32):
+        """Parse many files: concurrent extraction, one nlp.pipe pass, one batched encode.
+
+        Each source is a file path or a ``(data, filename)`` tuple.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            texts = list(executor.map(self._extract_source, sources))
+        texts = [text if text.strip() else "Text extraction failed or empty file" for text in texts]
+
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=SPACY_N_PROCESS)
+
+        # Generate embeddings safely
+        try:
+            embeddings = [vector.tolist() for vector in self.embedder.encode_documents(texts, batch_size=batch_size)]
+        except Exception as e:
+            print(f"Warning: batch embedding generation failed: {e}")
+            embeddings = [[] for _ in texts]
+
+        return [self._build_result(text, doc, embedding)
+                for text, doc, embedding in zip(texts, docs, embeddings)]
+
+    def _build_result(self, text, doc, embedding):
+        """Extract information from the processed text"""
+        skills = self._extract_skills(text)
+        education = self._extract_education(doc)
+        experience = self._extract_experience(text)
+
         return {
             'text': text,
             'skills': ', '.join(skills),
             'education': education,
             'experience': experience,
-            'embedding': json.dumps(embedding)
+            'embedding': embedding,  # list of floats; stored as float32 bytes by models.resume_store
+            'embedding_model': self.embedder.fingerprint,
         }
     
+    def _extract_source(self, source):
+        if isinstance(source, tuple):
+            return self._extract_text_from_buffer(*source)
+        return self._extract_text(source)
+
     def _extract_text(self, file_path):
+        """Extract text from a file on disk through a read-only memory map"""
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return self._extract_text_from_buffer(buffer, file_path)
+        except Exception as e:
+            print(f"Warning: failed to extract text from {file_path}: {e}")
+            return ""
+
+    def _extract_text_from_buffer(self, data, filename):
         """Extract text from PDF, DOCX, or TXT safely"""
         try:
-            if file_path.lower().endswith('.pdf'):
-                return self._extract_from_pdf(file_path)
-            elif file_path.lower().endswith('.docx'):
-                return self._extract_from_docx(file_path)
+            # mmap objects are already seekable streams; wrap plain bytes
+            stream = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
+            if filename.lower().endswith('.pdf'):
+                return self._extract_from_pdf(stream, filename)
+            elif filename.lower().endswith('.docx'):
+                return self._extract_from_docx(stream, filename)
             else:
                 # Fallback for txt or unknown files
-                with open(file_path, 'rb') as f:
-                    raw = f.read()
-                return raw.decode('utf-8', errors='ignore')
+                return bytes(data).decode('utf-8', errors='ignore')
         except Exception as e:
-            print(f"Warning: failed to extract text from {file_path}: {e}")
+            print(f"Warning: failed to extract text from {filename}: {e}")
             return ""
     
-    def _extract_from_pdf(self, file_path):
-        """Extract text from PDF safely"""
-        text = ""
+    def _extract_from_pdf(self, stream, filename):
+        """Extract text from PDF safely, within the page/time budgets of services.pdf_text"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            # Memory-mapped streams come from files on disk (see _extract_text), named by their path
+            path = filename if isinstance(stream, mmap.mmap) and os.path.isfile(filename) else None
+            return extract_pdf_text(stream, filename, path=path)
         except Exception as e:
-            print(f"Warning: PDF extraction failed for {file_path}: {e}")
-        return text
+            print(f"Warning: PDF extraction failed for {filename}: {e}")
+            return ""
     
-    def _extract_from_docx(self, file_path):
+    def _extract_from_docx(self, stream, filename):
         """Extract text from DOCX safely"""
         text = ""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(stream)
             text = '\n'.join([para.text for para in doc.paragraphs if para.text.strip()])
         except Exception as e:
-            print(f"Warning: DOCX extraction failed for {file_path}: {e}")
+            print(f"Warning: DOCX extraction failed for {filename}: {e}")
         return text
     
     def _extract_skills(self, text):
-        """Extract skills using regex patterns"""
-        text_lower = text.lower()
-        skills = set()
-        for pattern in self.skill_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            skills.update(matches)
-        return list(skills)
+        """Canonical ids of the taxonomy skills mentioned in the text"""
+        return self.skills.extract(text)
     
     def _extract_education(self, doc):
         """Extract education info from text using NLP"""
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import deque
+import numpy as np
+from decouple import config
+
+SKILL_TAXONOMY_PATH = config(
+    'SKILL_TAXONOMY_PATH',
+    default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_taxonomy.json'),
+)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def _normalize(text):
+    """Lowercase and collapse whitespace (PDF line breaks split multi-word skills)"""
+    return _WHITESPACE.sub(' ', text.lower())
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+class SkillTaxonomy:
+    """Canonical skills and their aliases, compiled into an Aho–Corasick automaton.
+
+    ``extract`` scans a text once, in time linear in its length plus the
+    number of matches, and returns canonical skill ids. Terms only match on
+    word boundaries; overlapping matches resolve leftmost-longest, so
+    "react native" wins over "react".
+
+    Each taxonomy skill also owns a bit position, so a skill set can be
+    packed into uint64 words (``encode``/``decode``). Positions follow the
+    taxonomy order and never change at runtime, so every process agrees
+    on them and index rows stay as wide as the taxonomy.
+    """
+
+    def __init__(self, skills):
+        """``skills`` is a list of ``{"id": ..., "aliases": [...]}`` entries"""
+        self.ids = []
+        self._goto = [{}]        # state -> {char: state}
+        self._fail = [0]         # state -> longest proper suffix state
+        self._output = [None]    # state -> (term length, skill id) if a term ends here
+        self._dict_link = [0]    # state -> nearest suffix state with an output
+
+        for entry in skills:
+            skill_id = entry['id'].strip().lower()
+            self.ids.append(skill_id)
+            for term in {skill_id, *entry.get('aliases', ())}:
+                self._add_term(_normalize(term).strip(), skill_id)
+        self._build_links()
+
+        payload = json.dumps(skills, sort_keys=True).encode('utf-8')
+        self.fingerprint = hashlib.sha1(payload).hexdigest()[:16]
+
+        self._vocabulary = list(self.ids)  # bit position -> skill id
+        self._bits = {skill_id: bit for bit, skill_id in enumerate(self._vocabulary)}
+
+    @classmethod
+    def from_file(cls, path=SKILL_TAXONOMY_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['skills'])
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ---------------- Matching ----------------
+    def extract(self, text):
+        """Canonical ids of the skills mentioned in ``text``, in order of first mention"""
+        text = _normalize(text or '')
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+
+        matches = []
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            node = state if output[state] else dict_link[state]
+            while node:
+                length, skill_id = output[node]
+                start = end - length
+                if ((start == 0 or not _is_word_char(text[start - 1])) and
+                        (end == len(text) or not _is_word_char(text[end]))):
+                    matches.append((start, -end, skill_id))
+                node = dict_link[node]
+
+        # Leftmost-longest, non-overlapping
+        matches.sort()
+        found, covered = {}, 0
+        for start, neg_end, skill_id in matches:
+            if start >= covered:
+                found.setdefault(skill_id, None)
+                covered = -neg_end
+        return list(found)
+
+    def canonicalize(self, skills):
+        """Map a comma-separated skill list (e.g. ``Job.skills_required``) to a set of ids.
+
+        Items the taxonomy does not know are kept, lowercased. They have no
+        bit, so callers carry them by name (see ``split``).
+        """
+        ids = set()
+        for item in (skills or '').split(','):
+            item = item.strip()
+            if item:
+                ids.update(self.extract(item) or [_normalize(item)])
+        return frozenset(ids)
+
+    # ---------------- Bitsets ----------------
+    def vocabulary(self):
+        """Skill ids by bit position"""
+        return list(self._vocabulary)
+
+    def adopt_vocabulary(self, vocabulary):
+        """Whether a persisted index used our bit positions (older indexes may have extra ones)"""
+        return list(vocabulary) == self._vocabulary
+
+    def encode(self, skills):
+        """Pack skill ids into a uint64 bitset; ids outside the taxonomy are dropped"""
+        bits = np.asarray([self._bits[skill_id] for skill_id in skills if skill_id in self._bits],
+                          dtype=np.uint64)
+        words = np.zeros(int(bits.max()) // 64 + 1 if bits.size else 0, dtype=np.uint64)
+        np.bitwise_or.at(words, (bits >> np.uint64(6)).astype(np.intp), np.uint64(1) << (bits & np.uint64(63)))
+        return words
+
+    def split(self, skills):
+        """``(encode(skills), the ids encode drops)``: a bitset plus the skills without a bit"""
+        return self.encode(skills), frozenset(skill_id for skill_id in skills if skill_id not in self._bits)
+
+    def decode(self, words):
+        """Skill ids whose bits are set, sorted by id"""
+        flags = np.unpackbits(np.asarray(words, dtype='<u8').view(np.uint8), bitorder='little')
+        return sorted(self._vocabulary[bit] for bit in np.flatnonzero(flags))
+
+    # ---------------- Construction ----------------
+    def _add_term(self, term, skill_id):
+        if not term:
+            return
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = (len(term), skill_id)
+
+    def _build_links(self):
+        # Breadth-first, so every suffix state is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._dict_link[child] = target if self._output[target] else self._dict_link[target]
+                queue.append(child)
+
+
+# ---------------- Process-wide taxonomy ----------------
+_taxonomy = None
+_lock = threading.Lock()
+
+def get_skill_taxonomy():
+    """Return the taxonomy loaded from SKILL_TAXONOMY_PATH, compiling it once per process"""
+    global _taxonomy
+    if _taxonomy is None:
+        with _lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.from_file()
+    return _taxonomy
@@ -0,0 +1,50 @@
+import hashlib
+import mmap
+import os
+from fastapi import HTTPException
+from decouple import config
+
+MAX_UPLOAD_BYTES = config('MAX_UPLOAD_BYTES', default=10 * 1024 * 1024, cast=int)
+# Media root shared with the Django backend (e.g. a common volume); empty = not shared
+SHARED_MEDIA_ROOT = config('SHARED_MEDIA_ROOT', default='')
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def read_upload(upload):
+    """Read an upload into memory chunk by chunk, hashing as it arrives"""
+    digest = hashlib.sha256()
+    data = bytearray()
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        data.extend(chunk)
+        if len(data) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_BYTES} bytes")
+        digest.update(chunk)
+    return bytes(data), digest.hexdigest()
+
+def resolve_shared_path(file_path, require_shared=False):
+    """Turn a stored media path into a local path, refusing anything outside SHARED_MEDIA_ROOT"""
+    if not SHARED_MEDIA_ROOT:
+        if require_shared:
+            raise HTTPException(status_code=400, detail="Path references need SHARED_MEDIA_ROOT to be configured")
+        # Legacy behaviour: the stored path is used as-is
+        return file_path
+
+    root = os.path.realpath(SHARED_MEDIA_ROOT)
+    resolved = os.path.realpath(os.path.join(root, file_path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=400, detail="Invalid file path")
+    return resolved
+
+def hash_file(file_path):
+    """SHA-256 of a file on disk, read through a memory map; enforces MAX_UPLOAD_BYTES"""
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    size = os.path.getsize(file_path)
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_BYTES} bytes")
+    if size == 0:
+        return hashlib.sha256().hexdigest()
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return hashlib.sha256(buffer).hexdigest()
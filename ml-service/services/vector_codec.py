@@ -0,0 +1,27 @@
+import numpy as np
+
+# Embeddings are stored in bytea columns as little-endian float32, whatever the host byte order
+VECTOR_DTYPE = np.dtype('<f4')
+
+def encode_vector(vector):
+    """Pack an embedding into the bytes stored in ``embedding`` columns"""
+    return np.asarray(vector, dtype=VECTOR_DTYPE).ravel().tobytes()
+
+def decode_vector(value, dim):
+    """Zero-copy float32 view of a stored embedding, or None if it is missing or not ``dim`` long"""
+    if value is None or len(value) != dim * VECTOR_DTYPE.itemsize:
+        return None
+    return np.frombuffer(value, dtype=VECTOR_DTYPE)
+
+def decode_vectors(values, dim):
+    """Stack many stored embeddings into one ``(n, dim)`` matrix.
+
+    The buffers are concatenated once and viewed with ``np.frombuffer``, so
+    loading thousands of vectors costs a single copy instead of one parse
+    per vector. Returns the matrix and a boolean mask of the inputs that
+    were valid (present and ``dim`` long); invalid ones have no row.
+    """
+    size = dim * VECTOR_DTYPE.itemsize
+    valid = np.array([value is not None and len(value) == size for value in values], dtype=bool)
+    buffer = b''.join(value for value, ok in zip(values, valid) if ok)
+    return np.frombuffer(buffer, dtype=VECTOR_DTYPE).reshape(-1, dim), valid
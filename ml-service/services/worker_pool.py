@@ -0,0 +1,71 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has its maximum number of pending jobs"""
+
+class WorkerPool:
+    """Bounded executor that keeps blocking work off the event loop.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more
+    may wait; anything beyond that is rejected with ``PoolSaturated`` so the
+    API can answer 429 instead of piling up requests.
+    """
+
+    def __init__(self, name, max_workers, max_queue, kind='thread', initializer=None, initargs=()):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+        if kind == 'process':
+            # spawn: forking a process that already holds torch/spaCy threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=name,
+                initializer=initializer,
+                initargs=initargs,
+            )
+
+    async def run(self, fn, *args, **kwargs):
+        """Run ``fn`` in the pool and await its result"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturated(f"{self.name} pool is full")
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'pending': self._pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,109 @@
+import re
+import threading
+import time
+import numpy as np
+import pytest
+from services import embedding_service
+from services.embedding_service import EmbeddingService
+
+DIM = 4
+
+class StubTokenizer:
+    """Whitespace tokenizer that fails like an HF fast tokenizer when called re-entrantly"""
+
+    def __init__(self):
+        self.busy = False
+
+    def __call__(self, text, **kwargs):
+        if self.busy:
+            raise RuntimeError('Already borrowed')
+        self.busy = True
+        try:
+            time.sleep(0.001)
+            return {'offset_mapping': [m.span() for m in re.finditer(r'\S+', text)]}
+        finally:
+            self.busy = False
+
+class StubModel:
+    """Maps each token ``t<n>`` to unit axis ``n % DIM`` and sums them per chunk"""
+
+    max_seq_length = 6  # windows of 4 tokens
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return DIM
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.split():
+                vectors[row, int(token[1:]) % DIM] += 1
+        return vectors
+
+def make_service(monkeypatch, **kwargs):
+    monkeypatch.setattr(embedding_service, 'load_model', lambda name, backend: StubModel())
+    return EmbeddingService('stub', **kwargs)
+
+def tokens(n):
+    return ' '.join(f't{i}' for i in range(n))
+
+def test_short_text_is_one_window(monkeypatch):
+    service = make_service(monkeypatch, overlap=2)
+    assert service._chunk(tokens(4)) == [tokens(4)]
+
+def test_windows_overlap(monkeypatch):
+    service = make_service(monkeypatch, overlap=2)
+    assert service.window == 4
+    assert service._chunk(tokens(10)) == ['t0 t1 t2 t3', 't2 t3 t4 t5', 't4 t5 t6 t7', 't6 t7 t8 t9']
+
+def test_overlap_is_capped_at_half_a_window(monkeypatch):
+    service = make_service(monkeypatch, overlap=10)
+    assert service.overlap == 2
+
+def test_max_chunks_caps_windows(monkeypatch):
+    service = make_service(monkeypatch, overlap=0, max_chunks=2)
+    assert service._chunk(tokens(20)) == ['t0 t1 t2 t3', 't4 t5 t6 t7']
+
+def test_mean_pooling(monkeypatch):
+    service = make_service(monkeypatch, overlap=0, pooling='mean')
+    # Windows [1, 1, 1, 1], [1, 1, 1, 1] and [1, 0, 0, 0] average to the direction of [3, 2, 2, 2]
+    vectors = service.encode_documents([tokens(9), 't1'])
+    expected = np.array([[3, 2, 2, 2], [0, 1, 0, 0]], dtype=np.float32)
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    assert vectors.shape == (2, DIM)
+    assert np.allclose(vectors, expected)
+    # All windows of all texts go through the model in one call
+    assert service.model.calls == [['t0 t1 t2 t3', 't4 t5 t6 t7', 't8', 't1']]
+
+def test_max_pooling(monkeypatch):
+    service = make_service(monkeypatch, overlap=0, pooling='max')
+    # Windows [3, 1, 0, 0] and [0, 2, 0, 0]: the mean would point along [3, 3, 0, 0]
+    vector = service.encode_document('t0 t4 t8 t1 t1 t5')
+    expected = np.array([3, 2, 0, 0], dtype=np.float32)
+    assert np.allclose(vector, expected / np.linalg.norm(expected))
+
+def test_unknown_pooling_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        make_service(monkeypatch, pooling='sum')
+
+def test_chunk_from_many_threads(monkeypatch):
+    service = make_service(monkeypatch, overlap=2)
+    errors = []
+
+    def work():
+        try:
+            for _ in range(20):
+                assert len(service._chunk(tokens(10))) == 4
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,57 @@
+import numpy as np
+from services.ivf_index import IVFJobIndex
+
+def clustered_index(min_size=0):
+    """Two well separated clusters of 50 jobs, job ids 0-49 near e0 and 50-99 near e1"""
+    rng = np.random.default_rng(1)
+    index = IVFJobIndex(dim=8, nlist=2, nprobe=1, min_size=min_size)
+    for job_id in range(100):
+        vector = rng.normal(scale=0.05, size=8).astype(np.float32)
+        vector[0 if job_id < 50 else 1] += 1
+        index.upsert(job_id, vector, facets={'job_type': 'contract' if job_id % 2 else 'full_time'})
+    return index
+
+def query(axis):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[axis] = 1
+    return vector
+
+def test_train_separates_clusters():
+    index = clustered_index()
+    assert index.needs_training
+    index.train()
+    assert index.is_trained and not index.needs_training
+    rows, _ = index.candidates(query(0))
+    assert sorted(int(job_id) for job_id in index.ids[rows]) == list(range(50))
+
+def test_candidates_keep_best_n():
+    index = clustered_index()
+    index.train()
+    rows, similarities = index.candidates(query(1), n=10)
+    assert len(rows) == 10
+    all_rows, all_similarities = index.candidates(query(1))
+    assert np.allclose(np.sort(similarities), np.sort(all_similarities)[-10:])
+    assert all(int(job_id) >= 50 for job_id in index.ids[rows])
+
+def test_candidates_filter_before_cap():
+    index = clustered_index()
+    index.train()
+    rows, _ = index.candidates(query(0), n=10, filters={'job_type': ['contract']})
+    assert len(rows) == 10
+    assert all(int(job_id) % 2 == 1 for job_id in index.ids[rows])
+
+def test_exact_below_min_size():
+    index = clustered_index(min_size=1000)
+    assert not index.needs_training
+    rows, similarities = index.candidates(query(0), n=10)
+    assert not index.is_trained
+    assert len(rows) == len(similarities) == 100
+
+def test_new_rows_are_assigned_after_training():
+    index = clustered_index()
+    index.train()
+    index.upsert(500, query(1))
+    index.remove(3)
+    rows, _ = index.candidates(query(1))
+    assert 500 in {int(job_id) for job_id in index.ids[rows]}
+    assert len(index) == 100
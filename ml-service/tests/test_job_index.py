@@ -0,0 +1,120 @@
+import threading
+import numpy as np
+from services.job_index import JobIndex
+
+def unit(*values):
+    vector = np.zeros(4, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector
+
+def make_index():
+    index = JobIndex(dim=4, initial_capacity=2)
+    index.upsert(1, unit(1, 0), skills=[0b011], facets={'job_type': 'full_time'}, title='a')
+    index.upsert(2, unit(0, 1), skills=[0b100], facets={'job_type': 'contract'}, title='b')
+    index.upsert(3, unit(1, 1), skills=[0b111], facets={'job_type': 'full_time'}, title='c')
+    return index
+
+def test_upsert_grows_and_normalizes():
+    index = make_index()
+    assert len(index) == 3 and 3 in index
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1)
+    assert index.metadata(2) == {'title': 'c'}
+
+def test_upsert_replaces_in_place():
+    index = make_index()
+    row = index.upsert(2, unit(1, 0), skills=[0b001], title='b2')
+    assert len(index) == 3 and row == 1
+    assert index.metadata(1) == {'title': 'b2'}
+    assert index.search(unit(1, 0), k=2)[0][0] in (1, 2)
+
+def test_remove_moves_last_row():
+    index = make_index()
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert len(index) == 2 and 1 not in index
+    assert list(index.ids) == [3, 2]
+    assert index.metadata(0) == {'title': 'c'}
+    assert int(index.skills(0)[0]) == 0b111
+
+def test_search_and_top_k():
+    index = make_index()
+    assert [job_id for job_id, _ in index.search(unit(1, 0), k=2)] == [1, 3]
+    scores = np.array([0.1, 0.9, 0.5, 0.9], dtype=np.float32)
+    assert list(JobIndex.top_k(scores, 3)) == [1, 3, 2]
+    assert list(JobIndex.top_k(scores, 10)) == [1, 3, 2, 0]
+    assert len(JobIndex.top_k(scores, 0)) == 0
+
+def test_similarities_of_wrong_size_query_are_zero():
+    index = make_index()
+    assert not index.similarities(np.ones(3)).any()
+
+def test_skill_overlap():
+    index = make_index()
+    matched, counts = index.skill_overlap(np.arange(3), np.array([0b101], dtype=np.uint64))
+    assert list(matched) == [1, 1, 2]
+    assert list(counts) == [2, 1, 3]
+
+def test_skill_overlap_with_wider_query():
+    index = make_index()
+    query = np.array([0b001, 0b1], dtype=np.uint64)
+    matched, _ = index.skill_overlap(np.arange(3), query)
+    assert list(matched) == [1, 0, 1]
+
+def test_skill_overlap_counts_other_skills_by_name(tmp_path):
+    index = make_index()
+    index.upsert(4, unit(0, 0, 1), skills=[0b001], other_skills=frozenset({'sap', 'salesforce'}), title='d')
+    rows = np.arange(len(index))
+    matched, required = index.skill_overlap(rows, np.array([0b001], dtype=np.uint64))
+    assert list(matched) == [1, 0, 1, 1] and list(required) == [2, 1, 3, 3]
+    matched, _ = index.skill_overlap(rows, np.array([0b001], dtype=np.uint64), frozenset({'sap'}))
+    assert list(matched) == [1, 0, 1, 2]
+    assert index.other_skills(3) == {'sap', 'salesforce'} and index.other_skills(0) == frozenset()
+
+    index.save(str(tmp_path))
+    loaded = JobIndex(dim=4)
+    loaded.load(str(tmp_path))
+    assert loaded.other_skills(3) == {'sap', 'salesforce'}
+    assert list(loaded.skill_overlap(rows, np.zeros(1, dtype=np.uint64))[1]) == [2, 1, 3, 3]
+
+def test_filter_mask():
+    index = make_index()
+    rows = np.arange(3)
+    assert list(index.filter_mask(rows, job_type=['full_time'])) == [True, False, True]
+    assert list(index.filter_mask(rows, job_type=lambda value: value == 'contract')) == [False, True, False]
+    assert not index.filter_mask(rows, job_type=['unknown']).any()
+    assert not index.filter_mask(rows, location=['remote']).any()
+
+def test_save_and_load_roundtrip(tmp_path):
+    index = make_index()
+    index.tag = 'v1'
+    index.save(str(tmp_path))
+    restored = JobIndex(dim=4)
+    restored.load(str(tmp_path))
+    assert list(restored.ids) == list(index.ids) and restored.tag == 'v1'
+    assert np.allclose(restored.matrix, index.matrix)
+    assert list(restored.filter_mask(np.arange(3), job_type=['contract'])) == [False, True, False]
+    restored.upsert(4, unit(0, 0, 1))
+    assert len(restored) == 4
+
+def test_save_writes_files_without_holding_the_lock(tmp_path, monkeypatch):
+    index = make_index()
+    free_during_write = []
+    original_save = np.save
+
+    def probe_lock():
+        # From another thread: an RLock held by the saving thread cannot be acquired
+        if index.lock.acquire(blocking=False):
+            index.lock.release()
+            free_during_write.append(True)
+        else:
+            free_during_write.append(False)
+
+    def checking_save(*args, **kwargs):
+        probe = threading.Thread(target=probe_lock)
+        probe.start()
+        probe.join()
+        return original_save(*args, **kwargs)
+
+    monkeypatch.setattr(np, 'save', checking_save)
+    index.save(str(tmp_path))
+    assert free_during_write and all(free_during_write)
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from services.job_index import JobIndex
+from services.job_matcher import JOB_SOURCE, JobMatcher, sync_since
+from services.skill_taxonomy import SkillTaxonomy
+from services.vector_codec import encode_vector
+
+T0 = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_sync_since_rereads_overlap_window():
+    watermark = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert sync_since(watermark, overlap=120) == watermark - timedelta(seconds=120)
+
+def test_sync_since_clamps_at_minimum():
+    floor = datetime.min.replace(tzinfo=timezone.utc)
+    assert sync_since(floor, overlap=120) == floor
+    assert sync_since(floor + timedelta(seconds=30), overlap=120) == floor
+
+class FakeCursor:
+    """Answers the sync queries from in-memory job rows and tombstones"""
+
+    def __init__(self, jobs, tombstones=()):
+        self.jobs = jobs              # id -> (title, skills, is_active, updated_at)
+        self.tombstones = list(tombstones)
+        self.queries = []
+        self._result = []
+
+    def execute(self, query, params=()):
+        self.queries.append(' '.join(query.split()))
+        if 'FROM jobs_deletedjob' in query:
+            self._result = [row for row in self.tombstones if row[1] >= params[0]]
+            return
+        rows = [(job_id, title, skills, 'mid', 'full-time', 'remote', encode_vector(np.ones(4, np.float32)),
+                 active, updated_at) for job_id, (title, skills, active, updated_at) in self.jobs.items()]
+        if 'WHERE updated_at >= %s' in query:
+            self._result = [row for row in rows if row[-1] >= params[0]]
+        else:
+            self._result = [row[:7] + row[8:] for row in rows if row[7]]
+
+    def fetchall(self):
+        return self._result
+
+def make_matcher():
+    matcher = JobMatcher.__new__(JobMatcher)
+    matcher.skills = SkillTaxonomy([{'id': 'python'}])
+    matcher.index = JobIndex(dim=4)
+    return matcher
+
+def test_sync_applies_changes_and_tombstones_without_counting():
+    matcher = make_matcher()
+    jobs = {1: ('a', 'Python', True, T0), 2: ('b', 'Python', True, T0), 3: ('c', 'SAP', True, T0)}
+    matcher._sync_rows(FakeCursor(jobs), matcher.index, JOB_SOURCE)
+    assert sorted(matcher.index.ids) == [1, 2, 3] and matcher.index.watermark == T0
+
+    later = T0 + timedelta(minutes=10)
+    del jobs[2]
+    jobs[3] = ('c', 'SAP', False, later)
+    jobs[4] = ('d', 'Python', True, later)
+    cursor = FakeCursor(jobs, tombstones=[(2, later)])
+    matcher._sync_rows(cursor, matcher.index, JOB_SOURCE)
+
+    assert sorted(matcher.index.ids) == [1, 4]
+    assert matcher.index.watermark == later
+    assert len(cursor.queries) == 2 and not any('COUNT' in query for query in cursor.queries)
+
+def test_sync_ignores_tombstones_older_than_the_overlap_window():
+    matcher = make_matcher()
+    jobs = {1: ('a', 'Python', True, T0)}
+    matcher._sync_rows(FakeCursor(jobs), matcher.index, JOB_SOURCE)
+    stale = T0 - timedelta(days=1)
+    matcher._sync_rows(FakeCursor(jobs, tombstones=[(1, stale)]), matcher.index, JOB_SOURCE)
+    assert list(matcher.index.ids) == [1]
+
+def test_rebuild_swaps_in_a_fresh_index():
+    matcher = make_matcher()
+    live = matcher.index
+    jobs = {1: ('a', 'Python', True, T0), 2: ('b', 'Python', True, T0)}
+    matcher._sync_rows(FakeCursor(jobs), live, JOB_SOURCE)
+    del jobs[2]  # deleted without a tombstone
+
+    matcher._rebuild_index(FakeCursor(jobs), live, JOB_SOURCE)
+
+    assert matcher.index is live
+    assert list(live.ids) == [1] and 2 not in live
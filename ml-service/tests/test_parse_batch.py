@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+import main
+from services import uploads
+
+class MemoryCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, content_hash):
+        return self.entries.get(content_hash)
+
+    def put(self, content_hash, result):
+        self.entries[content_hash] = result
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    root = tmp_path / 'media'
+    root.mkdir()
+    (root / 'one.txt').write_text('Python developer')
+    (root / 'big.txt').write_text('x' * 100)
+    paths = {1: 'one.txt', 2: 'deleted.txt', 3: 'big.txt', 4: '../outside.txt'}
+    saved = []
+
+    async def get_models():
+        return SimpleNamespace(parse_cache=MemoryCache())
+
+    monkeypatch.setattr(uploads, 'SHARED_MEDIA_ROOT', str(root))
+    monkeypatch.setattr(uploads, 'MAX_UPLOAD_BYTES', 50)
+    monkeypatch.setattr(main, 'get_models', get_models)
+    monkeypatch.setattr(main, 'lookup_resume_files', lambda ids: {i: paths[i] for i in ids if i in paths})
+    monkeypatch.setattr(main, 'save_parsed_resumes', saved.extend)
+    monkeypatch.setattr(main.parse_worker, 'parse_files', lambda files: [{'skills': ['python']} for _ in files])
+    return saved
+
+def test_one_bad_file_does_not_fail_the_batch(batch):
+    response = TestClient(main.app).post('/parse-resumes/batch', data={'resume_ids': ['1', '2', '3', '4', '5']})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['parsed'] == [1]
+    assert body['missing'] == [2, 5]
+    assert [error['resume_ids'] for error in body['errors']] == [[3], [4]]
+    assert [resume_id for resume_id, _ in batch] == [1]
+
+def test_oversize_upload_fails_only_its_resume(batch):
+    files = [('files', ('one.txt', b'Python developer')), ('files', ('big.txt', b'x' * 100))]
+    response = TestClient(main.app).post('/parse-resumes/batch', data={'resume_ids': ['1', '3']}, files=files)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['parsed'] == [1]
+    assert body['missing'] == []
+    assert [error['resume_ids'] for error in body['errors']] == [[3]]
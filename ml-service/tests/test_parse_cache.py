@@ -0,0 +1,68 @@
+import os
+from types import SimpleNamespace
+import pytest
+from services import resume_parser
+from services.parse_cache import ParseCache
+
+HASH_A = 'a' * 64
+HASH_B = 'b' * 64
+
+def test_put_then_get(tmp_path):
+    cache = ParseCache('v1', directory=str(tmp_path))
+    assert cache.get(HASH_A) is None
+    cache.put(HASH_A, {'skills': ['python']})
+    assert cache.get(HASH_A) == {'skills': ['python']}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+def test_versions_do_not_share_entries(tmp_path):
+    ParseCache('v1', directory=str(tmp_path)).put(HASH_A, {'n': 1})
+    assert ParseCache('v2', directory=str(tmp_path)).get(HASH_A) is None
+
+def test_invalidate_one_and_all(tmp_path):
+    cache = ParseCache('v1', directory=str(tmp_path))
+    cache.put(HASH_A, {'n': 1})
+    cache.put(HASH_B, {'n': 2})
+    assert cache.invalidate(HASH_A) == 1
+    assert cache.invalidate(HASH_A) == 0
+    assert cache.get(HASH_A) is None and cache.get(HASH_B) == {'n': 2}
+    assert cache.invalidate() == 1
+    assert cache.get(HASH_B) is None
+
+def test_invalid_hash_is_rejected(tmp_path):
+    cache = ParseCache('v1', directory=str(tmp_path))
+    with pytest.raises(ValueError):
+        cache.invalidate('../etc/passwd')
+
+def test_purge_stale_versions(tmp_path):
+    ParseCache('old', directory=str(tmp_path)).put(HASH_A, {'n': 1})
+    cache = ParseCache('new', directory=str(tmp_path))
+    cache.put(HASH_B, {'n': 2})
+    assert cache.purge_stale_versions() == ['old']
+    assert sorted(os.listdir(tmp_path)) == ['new']
+    assert cache.get(HASH_B) == {'n': 2}
+
+def test_purge_without_directory(tmp_path):
+    assert ParseCache('v1', directory=str(tmp_path / 'missing')).purge_stale_versions() == []
+
+def test_eviction_keeps_recently_read(tmp_path):
+    cache = ParseCache('v1', directory=str(tmp_path), max_entries=10)
+    hashes = [f"{i:064x}" for i in range(10)]
+    for i, content_hash in enumerate(hashes):
+        cache.put(content_hash, {'n': i})
+        os.utime(cache._path(content_hash), (i, i))
+    cache.get(hashes[0])
+    cache.put('f' * 64, {'n': 10})
+    assert cache.get(hashes[0]) == {'n': 0}
+    assert cache.get(hashes[1]) is None
+    assert cache.stats()['entries'] == 10
+
+def test_fingerprint_tracks_pdf_truncation(monkeypatch):
+    taxonomy = SimpleNamespace(fingerprint='tax')
+    before = resume_parser.parser_fingerprint('model', taxonomy)
+    assert resume_parser.parser_fingerprint('model', taxonomy) == before
+    monkeypatch.setattr(resume_parser, 'PDF_MAX_PAGES', resume_parser.PDF_MAX_PAGES + 1)
+    assert resume_parser.parser_fingerprint('model', taxonomy) != before
+    monkeypatch.undo()
+    monkeypatch.setattr(resume_parser, 'PDF_TEXT_BUDGET', resume_parser.PDF_TEXT_BUDGET + 1)
+    assert resume_parser.parser_fingerprint('model', taxonomy) != before
@@ -0,0 +1,105 @@
+import io
+import itertools
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from services import pdf_text
+from services.pdf_text import extract_pdf_text
+
+def make_pdf(page_texts):
+    """A minimal PDF with one line of Helvetica text per page"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in page_texts:
+        content = b'BT /F1 12 Tf 72 720 Td (%s) Tj ET' % text.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    out, offsets = io.BytesIO(), []
+    out.write(b'%PDF-1.4\n')
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    out.writelines(b'%010d 00000 n \n' % offset for offset in offsets)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+PAGES = [f'Page {n} skills python django' for n in range(1, 7)]
+EXPECTED = ''.join(f'{text}\n' for text in PAGES)
+
+@pytest.fixture
+def pdf():
+    return make_pdf(PAGES)
+
+@pytest.fixture
+def serial(monkeypatch):
+    monkeypatch.setattr(pdf_text, '_parallel', False)
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(pdf_text, '_parallel', True)
+    monkeypatch.setattr(pdf_text, 'PDF_WORKERS', 2)
+    monkeypatch.setattr(pdf_text, 'PDF_PARALLEL_MIN_PAGES', 2)
+    yield
+    pdf_text._reset_executor()
+
+def test_reads_every_page(pdf, serial):
+    assert extract_pdf_text(io.BytesIO(pdf)) == EXPECTED
+
+def test_page_budget(pdf, serial):
+    assert extract_pdf_text(io.BytesIO(pdf), max_pages=2) == f'{PAGES[0]}\n{PAGES[1]}\n'
+
+def test_text_budget_stops_after_the_page_that_reaches_it(pdf, serial):
+    assert extract_pdf_text(io.BytesIO(pdf), text_budget=len(PAGES[0]) + 2) == f'{PAGES[0]}\n{PAGES[1]}\n'
+
+def test_time_budget(pdf, serial, monkeypatch):
+    # Every clock read advances one second: the deadline passes before the third page
+    clock = itertools.count()
+    monkeypatch.setattr(pdf_text.time, 'time', lambda: next(clock))
+    assert extract_pdf_text(io.BytesIO(pdf), time_budget=2.5) == f'{PAGES[0]}\n{PAGES[1]}\n'
+
+def test_expired_time_budget_reads_nothing(pdf, serial):
+    assert extract_pdf_text(io.BytesIO(pdf), time_budget=0) == ''
+
+def test_parallel_matches_serial(pdf, parallel, tmp_path):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(pdf)
+    with open(path, 'rb') as f:
+        assert extract_pdf_text(f, path=str(path)) == EXPECTED
+    assert extract_pdf_text(io.BytesIO(pdf)) == EXPECTED
+    assert extract_pdf_text(io.BytesIO(pdf), max_pages=3) == ''.join(f'{text}\n' for text in PAGES[:3])
+    assert pdf_text._pool is not None
+
+class BrokenExecutor:
+    """Fails every range from ``broken_from`` on as a crashed pool would"""
+
+    def __init__(self, broken_from=0):
+        self.broken_from = broken_from
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        if self.broken_from == 0:
+            raise BrokenProcessPool()
+        future = Future()
+        if self.submitted > self.broken_from:
+            future.set_exception(BrokenProcessPool())
+        else:
+            future.set_result(fn(*args))
+        return future
+
+def test_broken_pool_on_submit_falls_back_to_serial(pdf, parallel, monkeypatch):
+    monkeypatch.setattr(pdf_text, '_executor', lambda: BrokenExecutor())
+    assert extract_pdf_text(io.BytesIO(pdf)) == EXPECTED
+
+def test_broken_pool_mid_document_continues_serially(pdf, parallel, monkeypatch):
+    executor = BrokenExecutor(broken_from=1)
+    monkeypatch.setattr(pdf_text, '_executor', lambda: executor)
+    assert extract_pdf_text(io.BytesIO(pdf)) == EXPECTED
+    assert executor.submitted == 2
@@ -0,0 +1,72 @@
+import numpy as np
+from services.skill_taxonomy import SkillTaxonomy
+
+SKILLS = [
+    {'id': 'python', 'aliases': ['py']},
+    {'id': 'react'},
+    {'id': 'react native', 'aliases': ['react-native']},
+    {'id': 'c++', 'aliases': ['cpp']},
+    {'id': 'machine learning', 'aliases': ['ml']},
+    {'id': 'java'},
+]
+
+def make_taxonomy():
+    return SkillTaxonomy(SKILLS)
+
+def test_extract_maps_aliases_in_order_of_mention():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("Py and ML, some CPP") == ['python', 'machine learning', 'c++']
+
+def test_extract_prefers_leftmost_longest():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("Built apps in React Native and React") == ['react native', 'react']
+
+def test_extract_respects_word_boundaries():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("javascript, happy, mlops") == []
+    assert taxonomy.extract("java.") == ['java']
+
+def test_extract_joins_terms_split_across_lines():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("machine\n  learning") == ['machine learning']
+
+def test_canonicalize_keeps_unknown_items():
+    taxonomy = make_taxonomy()
+    assert taxonomy.canonicalize("Python, React-Native,  Kubernetes ,") == {'python', 'react native', 'kubernetes'}
+    assert taxonomy.canonicalize(None) == frozenset()
+
+def test_encode_decode_roundtrip():
+    taxonomy = make_taxonomy()
+    words = taxonomy.encode({'python', 'java', 'react'})
+    assert words.dtype == np.uint64 and len(words) == 1
+    assert taxonomy.decode(words) == ['java', 'python', 'react']
+    assert len(taxonomy.encode(set())) == 0
+
+def test_encode_gives_unknown_skills_no_bit():
+    taxonomy = make_taxonomy()
+    vocabulary = taxonomy.vocabulary()
+    words = taxonomy.encode({f'unknown-{i}' for i in range(500)} | {'python'})
+    assert taxonomy.decode(words) == ['python']
+    assert taxonomy.vocabulary() == vocabulary
+
+def test_split_keeps_unknown_skills_by_name():
+    taxonomy = make_taxonomy()
+    words, other = taxonomy.split(taxonomy.canonicalize("Python, SAP, Salesforce"))
+    assert taxonomy.decode(words) == ['python']
+    assert other == {'sap', 'salesforce'}
+
+def test_encode_beyond_one_word():
+    taxonomy = SkillTaxonomy([{'id': f'skill-{i}'} for i in range(130)])
+    words = taxonomy.encode({'skill-0', 'skill-64', 'skill-129'})
+    assert len(words) == 3
+    assert taxonomy.decode(words) == ['skill-0', 'skill-129', 'skill-64']
+
+def test_adopt_vocabulary():
+    taxonomy = make_taxonomy()
+    assert taxonomy.adopt_vocabulary(taxonomy.vocabulary())
+    assert not taxonomy.adopt_vocabulary(taxonomy.vocabulary() + ['unknown'])
+    assert not taxonomy.adopt_vocabulary(list(reversed(taxonomy.vocabulary())))
+
+def test_fingerprint_follows_content():
+    assert make_taxonomy().fingerprint == make_taxonomy().fingerprint
+    assert SkillTaxonomy(SKILLS[:-1]).fingerprint != make_taxonomy().fingerprint
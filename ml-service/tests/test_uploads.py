@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from services import uploads
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    root = tmp_path / 'media'
+    (root / 'resumes').mkdir(parents=True)
+    monkeypatch.setattr(uploads, 'SHARED_MEDIA_ROOT', str(root))
+    return root
+
+def test_resolves_paths_inside_the_shared_root(media_root):
+    resolved = uploads.resolve_shared_path('resumes/cv.pdf')
+    assert resolved == os.path.join(os.path.realpath(media_root), 'resumes', 'cv.pdf')
+
+@pytest.mark.parametrize('file_path', ['../secret.pdf', 'resumes/../../secret.pdf', '/etc/passwd'])
+def test_refuses_paths_outside_the_shared_root(media_root, file_path):
+    with pytest.raises(HTTPException) as excinfo:
+        uploads.resolve_shared_path(file_path)
+    assert excinfo.value.status_code == 400
+
+def test_refuses_symlinks_out_of_the_shared_root(media_root, tmp_path):
+    (tmp_path / 'secret.pdf').write_bytes(b'%PDF')
+    os.symlink(tmp_path / 'secret.pdf', media_root / 'resumes' / 'link.pdf')
+    with pytest.raises(HTTPException) as excinfo:
+        uploads.resolve_shared_path('resumes/link.pdf')
+    assert excinfo.value.status_code == 400
+
+def test_path_references_need_a_shared_root(monkeypatch):
+    monkeypatch.setattr(uploads, 'SHARED_MEDIA_ROOT', '')
+    assert uploads.resolve_shared_path('resumes/cv.pdf') == 'resumes/cv.pdf'
+    with pytest.raises(HTTPException) as excinfo:
+        uploads.resolve_shared_path('resumes/cv.pdf', require_shared=True)
+    assert excinfo.value.status_code == 400
+
+def test_read_upload_returns_bytes_and_hash(monkeypatch):
+    monkeypatch.setattr(uploads, 'UPLOAD_CHUNK_SIZE', 4)
+    data = b'resume contents'
+    read, digest = asyncio.run(uploads.read_upload(UploadFile(io.BytesIO(data), filename='cv.txt')))
+    assert read == data
+    assert digest == hashlib.sha256(data).hexdigest()
+
+def test_read_upload_refuses_oversize_files(monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_UPLOAD_BYTES', 10)
+    monkeypatch.setattr(uploads, 'UPLOAD_CHUNK_SIZE', 4)
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(uploads.read_upload(UploadFile(io.BytesIO(b'x' * 11), filename='cv.txt')))
+    assert excinfo.value.status_code == 413
+
+def test_hash_file_checks_existence_and_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_UPLOAD_BYTES', 10)
+    small, large = tmp_path / 'small.txt', tmp_path / 'large.txt'
+    small.write_bytes(b'abc')
+    large.write_bytes(b'x' * 11)
+
+    assert uploads.hash_file(str(small)) == hashlib.sha256(b'abc').hexdigest()
+    for path, status in ((tmp_path / 'gone.txt', 404), (large, 413)):
+        with pytest.raises(HTTPException) as excinfo:
+            uploads.hash_file(str(path))
+        assert excinfo.value.status_code == status